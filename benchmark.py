@@ -0,0 +1,138 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import spiral.lib as sp
+import light_widgets.lib as lw
+import pygame as pg
+import multiprocessing
+import subprocess
+import platform
+import argparse
+import resource
+import time
+import json
+import math
+
+
+def _phase_line_drawer(program: sp.Program, count: int, result: dict):
+    canvas = sp.TiledCanvas(sp.CANVAS_SIZE)
+    segments = sp.SegmentBuffer()
+    line_drawer = sp.LineDrawer(sp.CANVAS_SIZE / 2, 0, lw.BLUE, canvas, segments=segments)
+    start = time.perf_counter()
+    for i, _ in enumerate(sp.animate(program, line_drawer, math.ceil(count / len(program))), 1):
+        if count <= i:
+            break
+    result["line_drawer_s"] = time.perf_counter() - start
+    result["line_drawer_segments_per_s"] = count / result["line_drawer_s"]
+
+
+def _phase_kernel(program: sp.Program, count: int, result: dict):
+    start = time.perf_counter()
+    path = sp.compute_segments(program, 0, count, sp.CANVAS_SIZE / 2)
+    result["geometry_s"] = time.perf_counter() - start
+    canvas = sp.TiledCanvas(sp.CANVAS_SIZE)
+    start = time.perf_counter()
+    sp.draw_path(path, canvas)
+    result["draw_path_s"] = time.perf_counter() - start
+    result["kernel_segments_per_s"] = count / (result["geometry_s"] + result["draw_path_s"])
+
+
+def _phase_animation(program: sp.Program, count: int, result: dict):
+    # the interactive loop of main() without the widgets: schedule a frame of segments, redraw the tiles they
+    # changed and update only those display rects, the whole canvas once on the first frame like after a click
+    import main
+    main.scheduler.reset()
+    start = time.perf_counter()
+    # as many steps as it takes to draw count segments, not the run length main() would pick for the display
+    coroutine = main.animation(program, steps=math.ceil(count / len(program)))
+    frame_times = []
+    blit_s = 0.0
+    while coroutine.get_position() < count:
+        frame_start = time.perf_counter()
+        finished = main.scheduler.advance(coroutine)
+        blit_start = time.perf_counter()
+        if len(frame_times) == 0:
+            main.surf2.render(main.display, main.surf2_rect.topleft)
+            main.surf2.pop_dirty_keys("display")
+            rects = [main.display.get_rect()]
+        else:
+            rects = main.surf2.render_keys(main.display, main.surf2_rect.topleft, main.surf2.pop_dirty_keys("display"))
+        main.surf2.compress_cold(main.display.get_rect().move(-main.surf2_rect.x, -main.surf2_rect.y))
+        if len(rects) > 0:
+            pg.display.update(rects)
+        blit_s += time.perf_counter() - blit_start
+        frame_times.append(time.perf_counter() - frame_start)
+        if len(frame_times) == 1:
+            result["time_to_first_frame_s"] = time.perf_counter() - start
+        if finished:
+            break
+    result["animation_s"] = time.perf_counter() - start
+    if coroutine.get_position() < count:
+        raise RuntimeError(f"the animation stopped after {coroutine.get_position()} of {count} segments")
+    result["animation_segments"] = coroutine.get_position()
+    result["animation_segments_per_s"] = coroutine.get_position() / result["animation_s"]
+    result["animation_frames"] = len(frame_times)
+    result["blit_s"] = blit_s
+    result["blit_ms_per_frame"] = blit_s * 1000 / max(len(frame_times), 1)
+    result["frame_ms_max"] = max(frame_times, default=0.0) * 1000
+
+
+PHASES = {"line_drawer": _phase_line_drawer,
+          "kernel": _phase_kernel,
+          "animation": _phase_animation}
+
+
+def _run_case(preset: str, count: int, phase: str) -> dict:
+    result = {"preset": preset, "segments": count, "phase": phase}
+    PHASES[phase](sp.PRESETS[preset](), count, result)
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    scale = 1 if platform.system() == "Darwin" else 1024
+    result["peak_rss_bytes"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+    return result
+
+
+def _get_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def main(args: list[str] = None):
+    parser = argparse.ArgumentParser(description="Measure spiral throughput, memory and latency")
+    parser.add_argument("--presets", nargs="+", default=list(sp.PRESETS), choices=list(sp.PRESETS))
+    parser.add_argument("--counts", type=int, nargs="+", default=[10 ** 4, 10 ** 5, 10 ** 6],
+                        help="segments drawn per case")
+    parser.add_argument("--phases", nargs="+", default=list(PHASES), choices=list(PHASES))
+    parser.add_argument("--output", default=None, help="json file for the results, printed when left out")
+    args = parser.parse_args(args)
+
+    # every case runs in a fresh process so peak memory belongs to that case alone
+    context = multiprocessing.get_context("fork" if "fork" in multiprocessing.get_all_start_methods() else None)
+    results = []
+    for preset in args.presets:
+        for count in args.counts:
+            for phase in args.phases:
+                with context.Pool(1) as pool:
+                    result = pool.apply(_run_case, (preset, count, phase))
+                results.append(result)
+                print(f"{preset:>8} {count:>8} {phase:>12} "
+                      f"{result.get(phase + '_segments_per_s', 0):>12.0f} segments/s "
+                      f"{result['peak_rss_bytes'] / 2 ** 20:>8.1f} MB", flush=True)
+
+    report = {"commit": _get_commit(),
+              "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+              "python": platform.python_version(),
+              "pygame": pg.version.ver,
+              "machine": platform.machine(),
+              "cpus": os.cpu_count(),
+              "results": results}
+    if args.output is None:
+        print(json.dumps(report, indent=4))
+    else:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=4)
+
+
+if __name__ == '__main__':
+    main()
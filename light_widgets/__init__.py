@@ -3,8 +3,10 @@ import light_widgets.utils
 import light_widgets.texture
 import light_widgets.widget
 import light_widgets.container
+import light_widgets.listview
 import light_widgets.image
 import light_widgets.label
 import light_widgets.button
 import light_widgets.textbox
 import light_widgets.slider
+import light_widgets.dirty
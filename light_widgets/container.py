@@ -2,6 +2,7 @@ from light_widgets.widget import *
 
 
 class Container(Widget):
+    _full_build: bool = True
     type_manager = TypeManager(seed=Widget.type_manager,
                                skip_invisible=TypeGroup(bool, conversion_func=TypeGroup.AUTO))
 
@@ -9,6 +10,12 @@ class Container(Widget):
         Widget.__init__(self)
         self.config(skip_invisible=True)
         self._widgets: dict[str, Widget] = {}
+        # children that changed since the last build, and where the last build drew each child
+        self._changed: dict[int, Widget] = {}
+        self._rects: dict[int, pg.Rect] = {}
+        self._order: list[int] = []
+        # what builds drew again since pop_damage, None for everything
+        self._damage: list[pg.Rect] | None = None
         if type(self) == Container:
             self.config(**properties)
 
@@ -20,22 +27,35 @@ class Container(Widget):
         wgt.set_parent(self)
         self.queue_build()
 
+    def queue_build(self):
+        # anything but a child changing draws the whole container again
+        self._full_build = True
+        Widget.queue_build(self)
+
+    def queue_child_build(self, widget: Widget):
+        self._changed[id(widget)] = widget
+        Widget.queue_build(self)
+
+    def pop_damage(self) -> list[pg.Rect] | None:
+        # the parts of the container drawn again since the last call in its own coordinates, None for all of it
+        damage, self._damage = self._damage, []
+        return damage if self.is_built() else None
+
+    def _is_skipped(self, widget: Widget):
+        return self.get_property("skip_invisible") and widget.get_visibility_mask() is not None and \
+            widget.get_visibility_mask().count() == 0
+
     @updatemethod
     def update(self, events: list[pg.event.Event]):
         Widget.update(self, events)
         self.build()
         for widget in self._widgets.values():
-            if self.get_property("skip_invisible") and widget.get_visibility_mask() is not None and \
-                    widget.get_visibility_mask().count() == 0:
+            if self._is_skipped(widget):
                 continue
             widget.update(events)
 
-    @buildmethod
-    def build(self):
-        Widget.build(self)
-
+    def _set_visibility_masks(self, widgets_list: list[Widget]):
         widget_surf = pg.Surface(self.get_property("size"), pg.SRCALPHA)
-        widgets_list = list(filter(lambda wgt: wgt.get_property("visible"), self._widgets.values()))
 
         for i in range(len(widgets_list) - 1):
             widget_surf.fill(CLEAR)
@@ -55,8 +75,95 @@ class Container(Widget):
         if len(widgets_list) > 0:
             widgets_list[-1].set_visibility_mask(None)
 
-        for widget in widgets_list:
-            if self.get_property("skip_invisible") and widget.get_visibility_mask() is not None and \
-                    widget.get_visibility_mask().count() == 0:
+    def _update_visibility_masks(self, widgets_list: list[Widget], changed: list[Widget]):
+        # a change only hides or shows other widgets where it touches them, when it touches none the changed
+        # widgets are hidden wherever they draw nothing, the same as _set_visibility_masks would find
+        for widget in changed:
+            rects = [rect for rect in (self._rects.get(id(widget)), widget.get_paint_rect()) if rect is not None]
+            for other in widgets_list:
+                if other is not widget and any(rect.colliderect(other.get_paint_rect()) for rect in rects):
+                    self._set_visibility_masks(widgets_list)
+                    return
+
+        for widget in changed:
+            if widget is widgets_list[-1]:
+                widget.set_visibility_mask(None)
                 continue
-            widget.render(self._surf)
+            rect = pg.Rect(widget.get_property("pos"), widget.get_property("size"))
+            rect = rect.clip(pg.Rect((0, 0), self.get_property("size")))
+            widget_surf = pg.Surface((max(rect.right, 0), max(rect.bottom, 0)), pg.SRCALPHA)
+            widget_surf.fill(CLEAR)
+            widget.render(widget_surf)
+            visibility_mask = pg.Mask(widget.get_property("size"))
+            if rect.w > 0 and rect.h > 0:
+                visibility_mask.draw(pg.mask.from_surface(widget_surf.subsurface(rect), MASK_THRESHOLD),
+                                     Pos(rect.topleft) - widget.get_property("pos"))
+            widget.set_visibility_mask(visibility_mask)
+
+    def _composite(self, widgets_list: list[Widget], rect: pg.Rect):
+        # draws the container again inside rect only
+        clip = self._surf.get_clip()
+        self._surf.set_clip(rect)
+        self._surf.fill(CLEAR, rect)
+        texture: Texture | None = self.get_property("texture")
+        if texture is not None:
+            texture.render(self._surf)
+        for widget in widgets_list:
+            if not self._is_skipped(widget) and widget.get_paint_rect().colliderect(rect):
+                widget.render(self._surf)
+        self._surf.set_clip(clip)
+
+    @buildmethod
+    def build(self):
+        widgets_list = list(filter(lambda wgt: wgt.get_property("visible"), self._widgets.values()))
+        order = [id(widget) for widget in widgets_list]
+        changed = [widget for widget in self._changed.values() if id(widget) in order]
+
+        if self._full_build or self._surf is None or order != self._order:
+            Widget.build(self)
+            self._set_visibility_masks(widgets_list)
+            for widget in widgets_list:
+                if self._is_skipped(widget):
+                    continue
+                widget.render(self._surf)
+                # what the widget redrew is part of all of it
+                if hasattr(widget, "pop_damage"):
+                    widget.pop_damage()
+            self._damage = None
+        elif len(changed) > 0:
+            # only the changed children are drawn again, with whatever is under or over them where they
+            # were and where they are now
+            damage = []
+            for widget in changed:
+                old_rect = self._rects.get(id(widget))
+                widget.build()
+                new_rect = widget.get_paint_rect()
+                child_damage = widget.pop_damage() if hasattr(widget, "pop_damage") else None
+                if child_damage is not None and old_rect == new_rect:
+                    damage.extend(rect.move(widget.get_property("pos")) for rect in child_damage)
+                else:
+                    damage.extend(rect for rect in (old_rect, new_rect) if rect is not None)
+            self._update_visibility_masks(widgets_list, changed)
+
+            bounds = self._surf.get_rect()
+            merged: list[pg.Rect] = []
+            for rect in damage:
+                rect = rect.clip(bounds)
+                if rect.w == 0 or rect.h == 0:
+                    continue
+                index = rect.collidelist(merged)
+                while index != -1:
+                    rect = rect.union(merged.pop(index))
+                    index = rect.collidelist(merged)
+                merged.append(rect)
+            for rect in merged:
+                self._composite(widgets_list, rect)
+            if self._damage is not None:
+                self._damage.extend(merged)
+            self._queue_parent_build()
+
+        self._rects = {id(widget): widget.get_paint_rect() for widget in widgets_list}
+        self._order = order
+        # children drawn by this build queued it again
+        self._changed.clear()
+        self._full_build = False
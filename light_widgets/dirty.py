@@ -0,0 +1,80 @@
+from light_widgets.widget import *
+
+
+class DirtyRenderer(object):
+    def __init__(self, background: pg.Color = WHITE):
+        # redraws only the parts of the display the widgets changed, the widgets should not overlap anything
+        # else drawn on the display
+        self.background = pg.Color(background)
+        self._widgets: list[Widget] = []
+        self._rects: dict[int, pg.Rect | None] = {}
+        self._dirty: list[pg.Rect] = []
+        self._full = True
+
+    def add(self, *widgets: Widget):
+        for widget in widgets:
+            self._widgets.append(widget)
+            self._rects[id(widget)] = None
+        self._full = True
+
+    def remove(self, widget: Widget):
+        self._widgets.remove(widget)
+        rect = self._rects.pop(id(widget))
+        if rect is not None:
+            self._dirty.append(rect)
+
+    def invalidate(self, rect: pg.Rect = None):
+        if rect is None:
+            self._full = True
+        else:
+            self._dirty.append(pg.Rect(rect))
+
+    def _collect(self) -> list[pg.Rect]:
+        dirty, self._dirty = self._dirty, []
+        for widget in self._widgets:
+            rect = None
+            if widget.get_property("visible"):
+                # built first so containers know which parts of them changed
+                widget.build()
+                rect = widget.get_paint_rect()
+            old_rect = self._rects[id(widget)]
+            damage = widget.pop_damage() if hasattr(widget, "pop_damage") else None
+            if widget.pop_render_queued() or rect != old_rect:
+                if damage is not None and rect == old_rect:
+                    dirty.extend(r.move(rect.topleft) for r in damage)
+                else:
+                    dirty.extend(r for r in (old_rect, rect) if r is not None and r.w > 0 and r.h > 0)
+            self._rects[id(widget)] = rect
+        # overlapping rects are merged so nothing is drawn twice
+        merged: list[pg.Rect] = []
+        for rect in dirty:
+            index = rect.collidelist(merged)
+            while index != -1:
+                rect = rect.union(merged.pop(index))
+                index = rect.collidelist(merged)
+            merged.append(rect)
+        return merged
+
+    def render(self, display: pg.Surface) -> list[pg.Rect]:
+        # the rects that changed, ready for pg.display.update, empty when nothing did
+        if self._full:
+            self._full = False
+            display.fill(self.background)
+            for widget in self._widgets:
+                widget.render(display)
+            # rendering builds, which queues renders of its own
+            self._dirty.clear()
+            self._collect()
+            return [display.get_rect()]
+
+        dirty = [rect.clip(display.get_rect()) for rect in self._collect()]
+        dirty = [rect for rect in dirty if rect.w > 0 and rect.h > 0]
+        clip = display.get_clip()
+        for rect in dirty:
+            display.set_clip(rect)
+            display.fill(self.background, rect)
+            for widget in self._widgets:
+                if widget.get_property("visible") and widget.get_paint_rect().colliderect(rect):
+                    widget.render(display)
+        display.set_clip(clip)
+        return dirty
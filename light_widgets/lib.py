@@ -2,8 +2,10 @@ from light_widgets.utils import *
 from light_widgets.texture import *
 from light_widgets.widget import *
 from light_widgets.container import *
+from light_widgets.listview import *
 from light_widgets.image import *
 from light_widgets.label import *
 from light_widgets.button import *
 from light_widgets.textbox import *
 from light_widgets.slider import *
+from light_widgets.dirty import *
@@ -0,0 +1,151 @@
+from light_widgets.container import *
+
+
+class VirtualList(Container):
+    type_manager = TypeManager(seed=Container.type_manager,
+                               row_size=TypeGroup(Size, conversion_func=TypeGroup.AUTO),
+                               columns=TypeGroup(int, conversion_func=TypeGroup.AUTO),
+                               scroll=TypeGroup(int, conversion_func=TypeGroup.AUTO),
+                               scroll_speed=TypeGroup(int, conversion_func=TypeGroup.AUTO))
+
+    def __init__(self, **properties):
+        # shows a list of items through a pool of row widgets, only the rows in view exist, rows that scroll out
+        # are bound to the items that scroll in, so the cost of a frame follows the height and not the item count
+        Container.__init__(self)
+        self._items: list = []
+        self._row_factory: typing.Optional[typing.Callable] = None
+        self._row_binder: typing.Optional[typing.Callable] = None
+        self._row_storer: typing.Optional[typing.Callable] = None
+        # item index -> the row showing it, and the rows waiting for an item
+        self._bound: dict[int, Widget] = {}
+        self._free: list[Widget] = []
+        self.set_event_listener(pg.MOUSEWHEEL, self.on_mouse_wheel)
+        self.config(row_size=Size(100, 30),
+                    columns=1,
+                    scroll=0,
+                    scroll_speed=30)
+        if type(self) == VirtualList:
+            self.config(**properties)
+
+    def config(self, **properties):
+        super().config(**properties)
+        if "scroll" in self._properties.keys() and self._row_factory is not None:
+            self._layout()
+
+    def set_row_factory(self, factory: typing.Callable):
+        # factory() makes an empty row widget
+        self._row_factory = factory
+        self._layout()
+
+    def set_row_binder(self, binder: typing.Callable, storer: typing.Callable = None):
+        # binder(row, item) shows the item on the row, storer(row, item) writes what was edited on the row back
+        # into the item before the row is given another one
+        self._row_binder = binder
+        self._row_storer = storer
+        self.refresh()
+
+    def get_items(self) -> list:
+        return self._items
+
+    def set_items(self, items: typing.Iterable):
+        self._release_rows()
+        self._items = list(items)
+        self._layout()
+
+    def get_row(self, index: int) -> Widget | None:
+        # the row showing the item, None while it is out of view
+        return self._bound.get(index)
+
+    def get_max_scroll(self):
+        return max(self.get_column_length() * self.get_property("row_size").h - self.get_property("size").h, 0)
+
+    def get_column_length(self) -> int:
+        # items fill the first column from the top, then the next one
+        return max(-(-len(self._items) // self.get_property("columns")), 1)
+
+    def scroll_to(self, index: int):
+        self.config(scroll=index % self.get_column_length() * self.get_property("row_size").h)
+
+    def store_rows(self):
+        # writes every row in view back into its item, call before reading the items
+        if self._row_storer is not None:
+            for index, row in self._bound.items():
+                self._row_storer(row, self._items[index])
+
+    def refresh(self):
+        # binds the rows in view again, for items that changed outside the list
+        self._release_rows()
+        self._layout()
+
+    def _release_rows(self):
+        self.store_rows()
+        self._free.extend(self._bound.values())
+        self._bound.clear()
+
+    def _layout(self):
+        if self._row_factory is None or self._row_binder is None:
+            return
+        scroll = min(max(self.get_property("scroll"), 0), self.get_max_scroll())
+        if scroll != self.get_property("scroll"):
+            Container.config(self, scroll=scroll)
+        row_size = self.get_property("row_size")
+        column_length = self.get_column_length()
+        top = scroll // row_size.h
+        # a row more than fits, since the top and bottom rows can both be cut off
+        bottom = min(top + self.get_property("size").h // row_size.h + 2, column_length)
+        shown = [index for column in range(self.get_property("columns"))
+                 for index in range(column * column_length + top, min(column * column_length + bottom,
+                                                                      len(self._items)))]
+
+        for index in [index for index in self._bound.keys() if index not in shown]:
+            row = self._bound.pop(index)
+            if self._row_storer is not None:
+                self._row_storer(row, self._items[index])
+            self._free.append(row)
+        for index in shown:
+            row = self._bound.get(index)
+            if row is None:
+                if len(self._free) > 0:
+                    row = self._free.pop()
+                else:
+                    row = self._row_factory()
+                    self.set_widget(f"row_{len(self._widgets)}", row)
+                self._row_binder(row, self._items[index])
+                self._bound[index] = row
+            row.config(visible=True, enabled=True)
+            pos = Pos(index // column_length * row_size.w, index % column_length * row_size.h - scroll)
+            if row.get_property("pos") != pos:
+                row.move(pos)
+                # the edges cut a moved row off differently, its mask is only set again by a full build
+                self.queue_build()
+        # spare rows are kept for later but neither drawn nor updated
+        for row in self._free:
+            row.config(visible=False, enabled=False)
+
+    def on_mouse_wheel(self, _, event: pg.event.Event):
+        if self.collide_pos(pg.mouse.get_pos(), CollisionType.ABS_POS):
+            self.config(scroll=self.get_property("scroll") - event.y * self.get_property("scroll_speed"))
+
+    def _set_visibility_masks(self, widgets_list: list[Widget]):
+        # the rows never overlap, unlike in a Container no row hides another and only the edges of the list cut
+        # them off, so their masks are only the part inside the list
+        bounds = pg.Rect((0, 0), self.get_property("size"))
+        for row in widgets_list:
+            if bounds.contains(pg.Rect(row.get_property("pos"), row.get_property("size"))):
+                row.set_visibility_mask(None)
+                continue
+            visibility_mask = pg.Mask(row.get_property("size"))
+            visibility_mask.draw(pg.Mask(bounds.size, True), -row.get_property("pos"))
+            row.set_visibility_mask(visibility_mask)
+
+    def _update_visibility_masks(self, widgets_list: list[Widget], changed: list[Widget]):
+        # a row only moves with the whole list, which sets every mask again
+        pass
+
+    @updatemethod
+    def update(self, events: list[pg.event.Event]):
+        # rows cut off at the edges reach past the list, presses there are not for them
+        rect = self.get_rect()
+        events = [event for event in events
+                  if event.type != pg.MOUSEBUTTONDOWN or rect.collidepoint(event.pos)]
+        Container.update(self, events)
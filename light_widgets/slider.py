@@ -78,6 +78,12 @@ class Slider(Widget):
     def set_value_changed_callback(self, callback: typing.Callable):
         self._value_changed_callback = callback
 
+    def get_paint_rect(self) -> pg.Rect:
+        # the top reaches past the bar
+        if self._top_rect is None:
+            return Widget.get_paint_rect(self)
+        return Widget.get_paint_rect(self).union(self._top_rect)
+
     @buildmethod
     def build(self):
         Widget.build(self)
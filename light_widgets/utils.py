@@ -323,6 +323,9 @@ class BuildManager(object):
     def queue_build(self):
         object.__setattr__(self, "_BuildManager__build_status", BuildStatus.NOT_BUILT)
 
+    def is_built(self):
+        return object.__getattribute__(self, "_BuildManager__build_status") == BuildStatus.BUILT
+
 
 class PropertyManager(BuildManager):
     type_manager = TypeManager()
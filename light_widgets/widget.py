@@ -9,6 +9,7 @@ class CollisionType(object):
 
 
 class Widget(PropertyManager):
+    _render_queued: bool = True
     type_manager = TypeManager(None,
                                pos=TypeGroup(Pos, conversion_func=TypeGroup.AUTO),
                                size=TypeGroup(Size, conversion_func=TypeGroup.AUTO),
@@ -93,6 +94,42 @@ class Widget(PropertyManager):
             return other.colliderect(self_pos, self.get_property("size"))
         return self.collide_mask(pg.Mask(other, True), -self_pos + other.topleft, collision_type)
 
+    def get_rect(self) -> pg.Rect:
+        return pg.Rect(self.get_abs_pos(), self.get_property("size"))
+
+    def get_paint_rect(self) -> pg.Rect:
+        # the part of the parent the widget draws on
+        return pg.Rect(self.get_property("pos"), self.get_property("size"))
+
+    def move(self, pos: PosType):
+        # config(pos=pos) without building the widget again, where it is does not change how it looks,
+        # only the parent draws again
+        pos = self.type_manager.check("pos", pos)
+        if pos != self.get_property("pos"):
+            self._properties["pos"] = pos
+            self._queue_parent_build()
+
+    def queue_build(self):
+        BuildManager.queue_build(self)
+        self._render_queued = True
+        self._queue_parent_build()
+
+    def _queue_parent_build(self):
+        # a parent that composites its children is told which one changed
+        queue_child_build = self.get_parent_attr("queue_child_build")
+        if queue_child_build is not None:
+            queue_child_build(self)
+            return
+        parent_queue_build = self.get_parent_attr("queue_build")
+        if parent_queue_build is not None:
+            parent_queue_build()
+
+    def pop_render_queued(self) -> bool:
+        # whether anything that changes how the widget looks happened since the last call
+        render_queued = self._render_queued
+        self._render_queued = False
+        return render_queued
+
     def get_event_listener(self, event_t: int) -> typing.Optional[typing.Callable]:
         return None if event_t not in self._event_listeners.keys() else self._event_listeners[event_t]
 
@@ -115,9 +152,7 @@ class Widget(PropertyManager):
         if texture is not None:
             texture.set_size(self.get_property("size"))
             texture.render(self._surf)
-        parent_queue_build = self.get_parent_attr("queue_build")
-        if parent_queue_build is not None:
-            parent_queue_build()
+        self._queue_parent_build()
 
     @rendermethod
     def render(self, display: pg.Surface):
@@ -1,7 +1,7 @@
 import standard_lib as std
 import light_widgets.lib as lw
+import spiral.lib as sp
 import pygame as pg
-import math
 
 
 pg.init()
@@ -12,12 +12,8 @@ degree_symbol = u"\N{DEGREE SIGN}"
 
 
 surf2_size = display_size * 10
-surf2 = pg.Surface(surf2_size)
-surf2.fill(lw.GREEN)
-
-
-DEGREES = 0
-RADIANS = 1
+# tiles left alone for about ten seconds outside the view are kept compressed
+surf2 = sp.TiledCanvas(surf2_size, cold_frames=600)
 
 
 container_texture = lw.GridTexture(resize_method=lw.ResizeMethod.STRETCH, grid_offsets=lw.GridOffsets(all_sides=2))
@@ -44,51 +40,53 @@ def create_textures():
 create_textures()
 
 
-class InstructionSet(object):
-    def __init__(self, pos: lw.Pos):
-        self.container = lw.Container(pos=pos, size=(600, 100), texture=container_texture.copy())
-        self.container.set_widget("img_color", lw.Image(pos=(10, 10), size=(80, 80), img=img_surf))
+class InstructionSet(lw.Container):
+    def __init__(self):
+        # one row of the instruction list, showing whichever instruction it is bound to
+        lw.Container.__init__(self)
+        self.config(size=(600, 100), texture=container_texture.copy())
+        self.set_widget("img_color", lw.Image(pos=(10, 10), size=(80, 80), img=img_surf))
 
         slider_len = 200
         sdr_texture.get_layer("bg").config(color=lw.RED)
-        self.container.set_widget("sdr_r", lw.Slider(pos=(110, 15), size=(slider_len, 10), texture=sdr_texture.copy(),
-                                                     range=(0, 255)))
+        self.set_widget("sdr_r", lw.Slider(pos=(110, 15), size=(slider_len, 10), texture=sdr_texture.copy(),
+                                           range=(0, 255)))
         sdr_texture.get_layer("bg").config(color=lw.GREEN)
-        self.container.set_widget("sdr_g", lw.Slider(pos=(110, 45), size=(slider_len, 10), texture=sdr_texture.copy(),
-                                                     range=(0, 255)))
+        self.set_widget("sdr_g", lw.Slider(pos=(110, 45), size=(slider_len, 10), texture=sdr_texture.copy(),
+                                           range=(0, 255)))
         sdr_texture.get_layer("bg").config(color=lw.BLUE)
-        self.container.set_widget("sdr_b", lw.Slider(pos=(110, 75), size=(slider_len, 10), texture=sdr_texture.copy(),
-                                                     range=(0, 255)))
-        self.container.get_widget("sdr_r").set_value_changed_callback(self.sdr_changed)
-        self.container.get_widget("sdr_g").set_value_changed_callback(self.sdr_changed)
-        self.container.get_widget("sdr_b").set_value_changed_callback(self.sdr_changed)
+        self.set_widget("sdr_b", lw.Slider(pos=(110, 75), size=(slider_len, 10), texture=sdr_texture.copy(),
+                                           range=(0, 255)))
+        self.get_widget("sdr_r").set_value_changed_callback(self.sdr_changed)
+        self.get_widget("sdr_g").set_value_changed_callback(self.sdr_changed)
+        self.get_widget("sdr_b").set_value_changed_callback(self.sdr_changed)
 
         new_start_x = slider_len + 130
-        self.container.set_widget("txt_r", lw.Textbox(pos=(new_start_x, 5), size=(50, 30), text=0))
-        self.container.set_widget("txt_g", lw.Textbox(pos=(new_start_x, 35), size=(50, 30), text=0))
-        self.container.set_widget("txt_b", lw.Textbox(pos=(new_start_x, 65), size=(50, 30), text=0))
-        self.container.get_widget("txt_r").bind_key(pg.K_RETURN, self.txt_return)
-        self.container.get_widget("txt_g").bind_key(pg.K_RETURN, self.txt_return)
-        self.container.get_widget("txt_b").bind_key(pg.K_RETURN, self.txt_return)
+        self.set_widget("txt_r", lw.Textbox(pos=(new_start_x, 5), size=(50, 30), text=0))
+        self.set_widget("txt_g", lw.Textbox(pos=(new_start_x, 35), size=(50, 30), text=0))
+        self.set_widget("txt_b", lw.Textbox(pos=(new_start_x, 65), size=(50, 30), text=0))
+        self.get_widget("txt_r").bind_key(pg.K_RETURN, self.txt_return)
+        self.get_widget("txt_g").bind_key(pg.K_RETURN, self.txt_return)
+        self.get_widget("txt_b").bind_key(pg.K_RETURN, self.txt_return)
 
         new_start_x += 60
-        self.container.set_widget("lbl_mag", lw.Label(pos=(new_start_x, 5), size=(100, 30), text="Magnitude:",
-                                                      txt_align=lw.Alignment.MIDRIGHT, font=lw.Font(color=lw.WHITE)))
-        self.container.set_widget("lbl_thick", lw.Label(pos=(new_start_x, 35), size=(100, 30), text="Thickness:",
-                                                        txt_align=lw.Alignment.MIDRIGHT, font=lw.Font(color=lw.WHITE)))
-        self.container.set_widget("lbl_angle", lw.Label(pos=(new_start_x, 65), size=(100, 30),
-                                                        text=f"Angle{degree_symbol}:", font=lw.Font(color=lw.WHITE),
-                                                        txt_align=lw.Alignment.MIDRIGHT))
+        self.set_widget("lbl_mag", lw.Label(pos=(new_start_x, 5), size=(100, 30), text="Magnitude:",
+                                            txt_align=lw.Alignment.MIDRIGHT, font=lw.Font(color=lw.WHITE)))
+        self.set_widget("lbl_thick", lw.Label(pos=(new_start_x, 35), size=(100, 30), text="Thickness:",
+                                              txt_align=lw.Alignment.MIDRIGHT, font=lw.Font(color=lw.WHITE)))
+        self.set_widget("lbl_angle", lw.Label(pos=(new_start_x, 65), size=(100, 30),
+                                              text=f"Angle{degree_symbol}:", font=lw.Font(color=lw.WHITE),
+                                              txt_align=lw.Alignment.MIDRIGHT))
         new_start_x += 105
-        self.container.set_widget("txt_mag", lw.Textbox(pos=(new_start_x, 5), size=(100, 30), text=.25))
-        self.container.set_widget("txt_thick", lw.Textbox(pos=(new_start_x, 35), size=(100, 30), text=.025))
-        self.container.set_widget("txt_angle", lw.Textbox(pos=(new_start_x, 65), size=(100, 30), text=45))
+        self.set_widget("txt_mag", lw.Textbox(pos=(new_start_x, 5), size=(100, 30), text=.25))
+        self.set_widget("txt_thick", lw.Textbox(pos=(new_start_x, 35), size=(100, 30), text=.025))
+        self.set_widget("txt_angle", lw.Textbox(pos=(new_start_x, 65), size=(100, 30), text=45))
 
     def sdr_changed(self, slider):
         txt, c = std.functions.switch(slider,
-                                      {self.container.get_widget("sdr_r"): (self.container.get_widget("txt_r"), 0),
-                                       self.container.get_widget("sdr_g"): (self.container.get_widget("txt_g"), 1),
-                                       self.container.get_widget("sdr_b"): (self.container.get_widget("txt_b"), 2)})
+                                      {self.get_widget("sdr_r"): (self.get_widget("txt_r"), 0),
+                                       self.get_widget("sdr_g"): (self.get_widget("txt_g"), 1),
+                                       self.get_widget("sdr_b"): (self.get_widget("txt_b"), 2)})
         new_color = int(slider.get_property("value"))
         txt.config(text=new_color)
         if len(txt.get_property("text")) < txt.current_index:
@@ -98,122 +96,98 @@ class InstructionSet(object):
                                                                                  new_color if c == 2 else 0))
         img = pg.Surface((80, 80), pg.SRCALPHA)
         try:
-            r = int(self.container.get_widget("txt_r").get_property("text"))
+            r = int(self.get_widget("txt_r").get_property("text"))
         except ValueError:
             r = 0
-            self.container.get_widget("sdr_r").config(value=0)
+            self.get_widget("sdr_r").config(value=0)
         try:
-            g = int(self.container.get_widget("txt_g").get_property("text"))
+            g = int(self.get_widget("txt_g").get_property("text"))
         except ValueError:
             g = 0
-            self.container.get_widget("sdr_g").config(value=0)
+            self.get_widget("sdr_g").config(value=0)
         try:
-            b = int(self.container.get_widget("txt_b").get_property("text"))
+            b = int(self.get_widget("txt_b").get_property("text"))
         except ValueError:
             b = 0
-            self.container.get_widget("sdr_b").config(value=0)
+            self.get_widget("sdr_b").config(value=0)
         img.fill(pg.Color(r, g, b))
-        self.container.get_widget("img_color").config(img=img)
+        self.get_widget("img_color").config(img=img)
 
     def txt_return(self, txt: lw.Textbox, _):
         sdr = std.functions.switch(txt,
-                                   {self.container.get_widget("txt_r"): self.container.get_widget("sdr_r"),
-                                    self.container.get_widget("txt_g"): self.container.get_widget("sdr_g"),
-                                    self.container.get_widget("txt_b"): self.container.get_widget("sdr_b")})
+                                   {self.get_widget("txt_r"): self.get_widget("sdr_r"),
+                                    self.get_widget("txt_g"): self.get_widget("sdr_g"),
+                                    self.get_widget("txt_b"): self.get_widget("sdr_b")})
         sdr.config(value=int(txt.get_property("text")))
 
-    def reset(self):
-        self.container.get_widget("sdr_r").config(value=0)
-        self.container.get_widget("sdr_g").config(value=0)
-        self.container.get_widget("sdr_b").config(value=0)
-
-        self.container.get_widget("txt_mag").config(text=0)
-        self.container.get_widget("txt_mag").current_index = 1
-        self.container.get_widget("txt_thick").config(text=0)
-        self.container.get_widget("txt_thick").current_index = 1
-        self.container.get_widget("txt_angle").config(text=0)
-        self.container.get_widget("txt_angle").current_index = 1
-
-
-class LineDrawer(object):
-    def __init__(self, start: lw.PosType, angle: float, color: pg.Color, surface: pg.Surface, mode=DEGREES):
-        self.original_vars = {"start": lw.Pos(start),
-                              "angle": angle,
-                              "color": color}
-        self.start = lw.Pos(start)
-        self.end = lw.Pos(0, 0)
-        self.angle = angle
-        self.color = color
-        self.surf = surface
-        self.mode = mode
-
-    def reset(self):
-        self.start = self.original_vars["start"].copy()
-        self.end = lw.Pos(0, 0)
-        self.angle = self.original_vars["angle"]
-        self.color = pg.Color(self.original_vars["color"])
-
-    def rotate(self, angle):
-        self.angle += angle
-        while self.angle < 0:
-            self.angle += 360 if self.mode == DEGREES else 2 * math.pi
-        while (360 if self.mode == DEGREES else 2 * math.pi) <= self.angle:
-            self.angle -= 360 if self.mode == DEGREES else 2 * math.pi
-
-    def forward(self, mag, thick):
-        self.end = self.start + (mag * math.cos(math.radians(self.angle) if self.mode == DEGREES else self.angle),
-                                 mag * math.sin(math.radians(self.angle) if self.mode == DEGREES else self.angle))
-        pg.draw.line(self.surf, self.color, self.start, self.end, int(thick))
-        self.start = self.end
-
-
-line_drawer = LineDrawer(surf2_size/2, 0, lw.BLUE, surf2)
-magnitude = 0
-thickness = 1
+    def _read_float(self, name: str):
+        try:
+            return float(self.get_widget(name).get_property("text"))
+        except ValueError:
+            self.get_widget(name).config(text=0)
+            self.get_widget(name).current_index = 1
+            return 0.0
+
+    def compile(self):
+        return sp.Instruction(self._read_float("txt_mag"), self._read_float("txt_thick"),
+                              self._read_float("txt_angle"),
+                              self.get_widget("img_color").get_property("img").get_at((0, 0)))
+
+    def bind(self, instruction: sp.Instruction):
+        # the textboxes first, they may still hold what was typed for the previous instruction
+        for name, value in (("txt_r", instruction.color.r), ("txt_g", instruction.color.g),
+                            ("txt_b", instruction.color.b), ("txt_mag", instruction.magnitude),
+                            ("txt_thick", instruction.thickness), ("txt_angle", instruction.angle)):
+            self.get_widget(name).config(text=value)
+            self.get_widget(name).current_index = len(self.get_widget(name).get_property("text"))
+        self.get_widget("sdr_r").config(value=instruction.color.r)
+        self.get_widget("sdr_g").config(value=instruction.color.g)
+        self.get_widget("sdr_b").config(value=instruction.color.b)
+        # a slider that kept its value did not redraw the color
+        self.sdr_changed(self.get_widget("sdr_r"))
+
+    def store(self, instruction: sp.Instruction):
+        compiled = self.compile()
+        instruction.magnitude = compiled.magnitude
+        instruction.thickness = compiled.thickness
+        instruction.angle = compiled.angle
+        instruction.color = compiled.color
+
+
+segments = sp.SegmentBuffer()
+viewer = sp.Viewer(segments, display_size, surf2_size/2)
+pyramid = sp.CanvasPyramid(surf2)
+# the endless run only keeps a window that follows the turtle and the segments it may scroll back onto
+stream_canvas = sp.StreamCanvas(display_size, keep=65536)
+scheduler = sp.FrameScheduler(budget_ms=12)
+cache = sp.ResultCache(max_entries=8)
 colors = (pg.Color(200, 200, 200), pg.Color(175, 175, 175), pg.Color(150, 150, 150))
 surf2_rect = surf2.get_rect()
 
 
-start_x = 50
-start_y = 50
-instructions: list[InstructionSet] = [InstructionSet(lw.Pos(start_x, start_y)),
-                                      InstructionSet(lw.Pos(start_x, start_y + 100)),
-                                      InstructionSet(lw.Pos(start_x, start_y + 200)),
-                                      InstructionSet(lw.Pos(start_x, start_y + 300)),
-                                      InstructionSet(lw.Pos(start_x, start_y + 400)),
-                                      InstructionSet(lw.Pos(start_x, start_y + 500)),
-                                      InstructionSet(lw.Pos(start_x + 600, start_y)),
-                                      InstructionSet(lw.Pos(start_x + 600, start_y + 100)),
-                                      InstructionSet(lw.Pos(start_x + 600, start_y + 200)),
-                                      InstructionSet(lw.Pos(start_x + 600, start_y + 300)),
-                                      InstructionSet(lw.Pos(start_x + 600, start_y + 400)),
-                                      InstructionSet(lw.Pos(start_x + 600, start_y + 500))]
-
-
-def animation():
-    global magnitude, thickness
+# the instructions themselves, the list only makes rows for the ones in view and binds them as it scrolls
+instruction_list = lw.VirtualList(pos=(50, 50), size=(1200, 600), row_size=(600, 100), columns=2, scroll_speed=50)
+instruction_list.set_row_factory(InstructionSet)
+instruction_list.set_row_binder(InstructionSet.bind, InstructionSet.store)
+
+
+def compile_program():
+    # the rows in view may hold edits their instructions have not seen yet
+    instruction_list.store_rows()
+    return sp.Program(instruction_list.get_items())
+
+
+def animation(program: sp.Program, cached_segments: sp.SegmentBuffer = None, steps: int = None):
     surf2_rect.center = lw.Size(display.get_size()) / 2
-    magnitude, thickness = 0, 1
-    for _ in range(int(min(display_size) * len(instructions))):
-        for instruction_set in instructions:
-            line_drawer.color = instruction_set.container.get_widget("img_color").get_property("img").get_at((0, 0))
-            line_drawer.forward(magnitude, thickness)
-            try:
-                magnitude += float(instruction_set.container.get_widget("txt_mag").get_property("text"))
-            except ValueError:
-                instruction_set.container.get_widget("txt_mag").config(text=0)
-                instruction_set.container.get_widget("txt_mag").current_index = 1
-            try:
-                thickness += float(instruction_set.container.get_widget("txt_thick").get_property("text"))
-            except ValueError:
-                instruction_set.container.get_widget("txt_thick").config(text=0)
-                instruction_set.container.get_widget("txt_thick").current_index = 1
-            try:
-                line_drawer.rotate(float(instruction_set.container.get_widget("txt_angle").get_property("text")))
-            except ValueError:
-                instruction_set.container.get_widget("txt_angle").config(text=0)
-                instruction_set.container.get_widget("txt_angle").current_index = 1
-            (yield)
+    if cached_segments is not None:
+        segments.extend(cached_segments.starts, cached_segments.ends, cached_segments.thicknesses,
+                        cached_segments.colors)
+        return sp.Timeline(program, surf2, segments, None, surf2_size/2)
+    # the geometry is computed on a worker thread, this thread only draws what arrived
+    if steps is None:
+        steps = program.default_steps(display_size)
+    worker = sp.SimulationWorker(program, steps, surf2_size/2)
+    return sp.Timeline(program, surf2, segments, sp.animate_worker(worker, surf2, segments), surf2_size/2)
 
 
 def main():
@@ -226,71 +200,151 @@ def main():
     btn_texture.add_layer("outline", lw.Layer(surf, lw.BLACK))
 
     def btn_click(_, __):
-        nonlocal coroutine
-        coroutine = animation()
-        line_drawer.reset()
-        surf2.fill(lw.WHITE)
+        nonlocal coroutine, run_key, cached_run, redraw
+        if coroutine is not None:
+            coroutine.close()
+        scheduler.reset()
+        surf2.clear()
+        segments.clear()
+        viewer.set_center(surf2_size/2)
+        viewer.set_zoom(1)
+        program = compile_program()
+        run_key = sp.ResultCache.make_key(program, program.default_steps(display_size))
+        entry = cache.get(run_key)
+        cached_run = entry is not None and entry.segments is not None
+        coroutine = animation(program, entry.segments if cached_run else None)
+        redraw = True
+
+    def btn_stream_click(_, __):
+        nonlocal stream, stream_paused
+        scheduler.reset()
+        stream_canvas.clear()
+        stream_canvas.center_on((0, 0))
+        program = compile_program()
+        stream = sp.animate_worker(sp.SimulationWorker(program, None), stream_canvas)
+        stream_paused = False
 
     def btn_reset_click(_, __):
-        for instruct in instructions:
-            instruct.reset()
+        instruction_list.set_items(sp.Instruction(0, 0, 0, lw.BLACK) for _ in instruction_list.get_items())
 
     btn_run = lw.Button(pos=(display_size.w * 2 / 3 - 100, display_size.h - 75), size=(200, 50),
                         texture=btn_texture.copy(), text="Run", txt_align=lw.Alignment.CENTER, cmd=btn_click)
     btn_reset = lw.Button(pos=(display_size.w / 3 - 100, display_size.h - 75), size=(200, 50),
                           texture=btn_texture.copy(), text="Reset", txt_align=lw.Alignment.CENTER, cmd=btn_reset_click)
+    btn_stream = lw.Button(pos=(display_size.w / 2 - 100, display_size.h - 75), size=(200, 50),
+                           texture=btn_texture.copy(), text="Infinite", txt_align=lw.Alignment.CENTER,
+                           cmd=btn_stream_click)
     lbl_warning_top = lw.Label(pos=(display_size.w / 2 - 300, 0), size=(600, 50), text="EPILEPSY WARNING",
                                txt_align=lw.Alignment.CENTER, font=lw.Font(name="helvetica", size=32, bold=True))
     lbl_warning_bottom = lbl_warning_top.copy()
     lbl_warning_bottom.config(pos=(display_size.w / 2 - 300, 650))
+    renderer = lw.DirtyRenderer(lw.WHITE)
+    renderer.add(instruction_list)
+    renderer.add(btn_reset, btn_stream, btn_run, lbl_warning_top, lbl_warning_bottom)
 
-    for i in range(len(instructions)):
-        instructions[i].reset()
-        instructions[i].container.get_widget("txt_mag").config(text=.25)
-        instructions[i].container.get_widget("txt_thick").config(text=.025)
-        if i < 4:
-            instructions[i].container.get_widget("sdr_r").config(value=255)
-        elif i < 8:
-            instructions[i].container.get_widget("sdr_g").config(value=255)
-        else:
-            instructions[i].container.get_widget("sdr_b").config(value=255)
-        if i % 4 == 0:
-            instructions[i].container.get_widget("txt_angle").config(text=118)
-        elif i % 4 == 1:
-            instructions[i].container.get_widget("txt_angle").config(text=-57)
-        elif i % 4 == 2:
-            instructions[i].container.get_widget("txt_angle").config(text=160)
+    instruction_list.set_items(sp.PRESETS["default"]())
 
     done_animating = False
+    viewing = False
     coroutine = None
+    run_key = None
+    cached_run = False
+    stream = None
+    stream_paused = False
+    # the canvas view has to be drawn whole instead of only the tiles that changed
+    redraw = False
+    # zooming out of the canvas view shows the pyramid level that matches instead of the canvas
+    overview_zoom = 1.0
     while True:
         events = pg.event.get()
         for event in events:
             if event.type == pg.QUIT:
+                if coroutine is not None:
+                    coroutine.close()
+                if stream is not None:
+                    stream.close()
                 return
-        display.fill(lw.WHITE)
         if coroutine is not None:
-            if not done_animating:
-                try:
-                    next(coroutine)
-                except StopIteration:
-                    done_animating = True
-            display.blit(surf2, surf2_rect)
+            if not done_animating and not coroutine.is_paused():
+                done_animating = scheduler.advance(coroutine)
+                if done_animating and not cached_run:
+                    cache.put(run_key, segments)
+                    cached_run = True
+                stats = scheduler.get_stats()
+                pg.display.set_caption(f"{stats['last_segments']} segments/frame, "
+                                       f"{stats['last_ms']:.1f}/{stats['budget_ms']:.1f} ms")
+            elif coroutine.is_paused():
+                pg.display.set_caption(f"paused at segment {coroutine.get_position()}/{coroutine.get_length()}")
+            if viewing:
+                viewer.update(events)
+                rects = viewer.render(display)
+            elif overview_zoom < 1:
+                changed = pyramid.update()
+                rects = pyramid.render(display, surf2_size/2, overview_zoom,
+                                       None if redraw else changed[pyramid.get_level(overview_zoom)])
+            elif redraw:
+                surf2.render(display, surf2_rect.topleft)
+                surf2.pop_dirty_keys("display")
+                rects = [display.get_rect()]
+            else:
+                rects = surf2.render_keys(display, surf2_rect.topleft, surf2.pop_dirty_keys("display"))
+            redraw = False
             for event in events:
                 if event.type == pg.KEYUP and event.key == pg.K_ESCAPE:
+                    coroutine.close()
                     done_animating = False
                     coroutine = None
+                    viewing = False
+                    renderer.invalidate()
+                elif event.type == pg.KEYUP and event.key == pg.K_v:
+                    viewing = not viewing
+                    viewer.invalidate()
+                    redraw = True
+                elif event.type == pg.MOUSEWHEEL and not viewing:
+                    overview_zoom = min(max(overview_zoom * 1.25 ** event.y,
+                                            min(display_size.w / surf2_size.w, display_size.h / surf2_size.h)), 1)
+                    redraw = True
+                elif event.type == pg.KEYUP and event.key == pg.K_SPACE:
+                    coroutine.toggle_pause()
+                elif event.type == pg.KEYUP and event.key in (pg.K_LEFT, pg.K_RIGHT):
+                    # scrub a hundredth of the run, restoring the nearest checkpoint instead of starting over
+                    scrub = max(coroutine.program.default_steps(display_size) * len(coroutine.program) // 100, 1)
+                    coroutine.pause()
+                    coroutine.seek(coroutine.get_position() + (scrub if event.key == pg.K_RIGHT else -scrub))
+                    done_animating = coroutine.is_finished()
+                elif event.type == pg.KEYUP and event.key == pg.K_RETURN and not done_animating:
+                    for item in coroutine:
+                        if item is sp.WAITING:
+                            # the worker is still computing the rest, let it have the time
+                            pg.time.wait(1)
+                    done_animating = True
+                    if not cached_run:
+                        cache.put(run_key, segments)
+                        cached_run = True
+        elif stream is not None:
+            if not stream_paused:
+                scheduler.advance(stream)
+                stats = scheduler.get_stats()
+                pg.display.set_caption(f"{stats['segments']} segments, {stats['last_segments']} segments/frame")
+            rects = stream_canvas.render(display)
+            for event in events:
+                if event.type == pg.KEYUP and event.key == pg.K_ESCAPE:
+                    stream.close()
+                    stream = None
+                    renderer.invalidate()
+                elif event.type == pg.KEYUP and event.key == pg.K_SPACE:
+                    stream_paused = not stream_paused
         else:
             btn_run.update(events)
+            btn_stream.update(events)
             btn_reset.update(events)
-            for instruct_set in instructions:
-                instruct_set.container.update(events)
-                instruct_set.container.render(display)
-            btn_reset.render(display)
-            btn_run.render(display)
-            lbl_warning_top.render(display)
-            lbl_warning_bottom.render(display)
-        pg.display.flip()
+            instruction_list.update(events)
+            rects = renderer.render(display)
+        shown = coroutine is not None and not viewing and overview_zoom == 1
+        surf2.compress_cold(display.get_rect().move(-surf2_rect.x, -surf2_rect.y) if shown else None)
+        # idle frames change nothing and present nothing
+        if len(rects) > 0:
+            pg.display.update(rects)
 
 
 if __name__ == '__main__':
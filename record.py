@@ -0,0 +1,33 @@
+import spiral.lib as sp
+import argparse
+import os
+
+
+def main(args: list[str] = None):
+    parser = argparse.ArgumentParser(description="Record a spiral program being drawn, frame by frame")
+    parser.add_argument("program", help="program json file, see spiral.program.Program.save")
+    parser.add_argument("output", help="directory for a png sequence, a .raw file for raw rgb24 frames, "
+                                       "anything else is encoded with ffmpeg")
+    parser.add_argument("--every", type=int, default=1000, help="segments drawn between two frames")
+    parser.add_argument("--steps", type=int, default=None)
+    parser.add_argument("--size", type=int, nargs=2, default=None, metavar=("WIDTH", "HEIGHT"),
+                        help="frame size with the spiral centered, fitted to the whole run when left out")
+    parser.add_argument("--fps", type=float, default=30)
+    parser.add_argument("--queue", type=int, default=8, help="frames waiting for the writer before drawing waits")
+    args = parser.parse_args(args)
+    program = sp.Program.load(args.program)
+    # fitted once here, the ffmpeg stream needs the size before the frames are drawn
+    size, start = (args.size, None) if args.size is not None else sp.fit_canvas(program, args.steps)
+    extension = os.path.splitext(args.output)[1].lower()
+    if extension == "":
+        writer = sp.PngSequenceWriter(args.output, max_queue=args.queue)
+    elif extension == ".raw":
+        writer = sp.RawVideoWriter(args.output, max_queue=args.queue)
+    else:
+        writer = sp.RawVideoWriter(command=sp.ffmpeg_command(args.output, size, args.fps), max_queue=args.queue)
+    with writer:
+        sp.export_frames(program, writer, args.every, args.steps, size, start=start)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+import spiral.lib as sp
+import argparse
+import os
+
+
+def main(args: list[str] = None):
+    parser = argparse.ArgumentParser(description="Render a spiral program straight to an image file")
+    parser.add_argument("program", help="program json file, see spiral.program.Program.save")
+    parser.add_argument("output", help="image file, the format is picked from the extension, "
+                                       ".svg streams the run as vector polylines without a raster")
+    parser.add_argument("--steps", type=int, default=None)
+    parser.add_argument("--size", type=int, nargs=2, default=None, metavar=("WIDTH", "HEIGHT"),
+                        help="canvas size with the spiral centered, fitted to the spiral when left out, "
+                             "with --density the fitted canvas is scaled down to the display size")
+    parser.add_argument("--processes", type=int, default=None,
+                        help="rasterize the canvas in tiles across this many worker processes")
+    parser.add_argument("--cache", default=None, metavar="DIRECTORY",
+                        help="reuse renders of identical programs stored in this directory")
+    parser.add_argument("--window", type=int, nargs=2, default=None, metavar=("FIRST", "LAST"),
+                        help="only draw the segments in [FIRST, LAST) of the run")
+    parser.add_argument("--antialias", action="store_true",
+                        help="blend the lines with their fractional widths, a quality option that is far slower "
+                             "than the default and single process")
+    parser.add_argument("--density", action="store_true",
+                        help="add up how much line covers every pixel and tone map it, for runs long enough to "
+                             "paint everything over")
+    parser.add_argument("--band", type=int, default=None, metavar="HEIGHT",
+                        help="draw a png this many rows at a time straight into the file, for posters too big "
+                             "to hold in memory")
+    args = parser.parse_args(args)
+    # the svg and banded png writers only take the steps and size, the other options belong to the raster render
+    svg = os.path.splitext(args.output)[1].lower() == ".svg"
+    raster_options = [name for name, given in (("--processes", args.processes is not None),
+                                               ("--cache", args.cache is not None), ("--antialias", args.antialias),
+                                               ("--density", args.density), ("--window", args.window is not None))
+                      if given]
+    if svg and args.band is not None:
+        parser.error("--band cannot be used with .svg output")
+    if (svg or args.band is not None) and len(raster_options) > 0:
+        parser.error(f"{', '.join(raster_options)} cannot be used with {'.svg output' if svg else '--band'}")
+    if args.density and (args.antialias or args.processes is not None):
+        parser.error("--density cannot be used with --antialias or --processes")
+    if args.antialias and args.processes is not None:
+        parser.error("--antialias draws on one surface and cannot be used with --processes")
+    if svg:
+        sp.export_svg(sp.Program.load(args.program), args.output, args.steps, args.size)
+        return
+    if args.band is not None:
+        sp.export_poster(sp.Program.load(args.program), args.output, args.steps, args.size, band_height=args.band)
+        return
+    cache = None if args.cache is None else sp.ResultCache(directory=args.cache)
+    sp.render_to_file(sp.Program.load(args.program), args.output, args.steps, args.size, processes=args.processes,
+                      cache=cache, window=args.window,
+                      antialias=args.antialias, density=args.density)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,22 @@
+import spiral.error
+import spiral.canvas
+import spiral.segments
+import spiral.drawer
+import spiral.program
+import spiral.seek
+import spiral.kernel
+import spiral.raster
+import spiral.density
+import spiral.parallel
+import spiral.cache
+import spiral.scheduler
+import spiral.viewer
+import spiral.pyramid
+import spiral.timeline
+import spiral.worker
+import spiral.stream
+import spiral.headless
+import spiral.export
+import spiral.vector
+import spiral.poster
+import spiral.sweep
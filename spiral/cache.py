@@ -0,0 +1,102 @@
+from spiral.segments import *
+from spiral.program import Program
+from collections import OrderedDict
+import hashlib
+import os
+
+
+class CacheEntry(object):
+    def __init__(self, segments: SegmentBuffer = None, raster: pg.Surface = None):
+        self.segments = segments
+        self.raster = raster
+
+
+class ResultCache(object):
+    def __init__(self, max_entries: int = 8, directory: str = None):
+        self.max_entries = max_entries
+        self.directory = directory
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        if directory is not None and not os.path.exists(directory):
+            os.makedirs(directory)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key: str):
+        if key in self._entries:
+            return True
+        return self.directory is not None and any(os.path.exists(self._get_file(key, extension))
+                                                  for extension in (".npz", ".png"))
+
+    @staticmethod
+    def make_key(program: Program, steps: int, *extra):
+        return hashlib.sha256(f"{program.get_digest()}:{steps}:{extra!r}".encode()).hexdigest()
+
+    def _get_file(self, key: str, extension: str):
+        return os.path.join(self.directory, key + extension)
+
+    def _load(self, key: str) -> CacheEntry | None:
+        if self.directory is None:
+            return None
+        entry = CacheEntry()
+        if os.path.exists(self._get_file(key, ".npz")):
+            with np.load(self._get_file(key, ".npz")) as data:
+                entry.segments = SegmentBuffer(max(len(data["lines"]), 1))
+                entry.segments.extend(data["lines"][:, :2], data["lines"][:, 2:], data["thicknesses"], data["colors"])
+        if os.path.exists(self._get_file(key, ".png")):
+            entry.raster = pg.image.load(self._get_file(key, ".png"))
+        if entry.segments is None and entry.raster is None:
+            return None
+        return entry
+
+    def _save(self, key: str, entry: CacheEntry):
+        if entry.segments is not None:
+            np.savez_compressed(self._get_file(key, ".npz"),
+                                lines=np.hstack((entry.segments.starts, entry.segments.ends)),
+                                thicknesses=entry.segments.thicknesses, colors=entry.segments.colors)
+        if entry.raster is not None:
+            pg.image.save(entry.raster, self._get_file(key, ".png"))
+
+    def get(self, key: str) -> CacheEntry | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._load(key)
+            if entry is not None:
+                self._store(key, entry)
+        else:
+            self._entries.move_to_end(key)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def _store(self, key: str, entry: CacheEntry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while self.max_entries < len(self._entries):
+            self._entries.popitem(last=False)
+
+    def put(self, key: str, segments: SegmentBuffer = None, raster: pg.Surface = None):
+        entry = self._entries.get(key, CacheEntry())
+        if segments is not None:
+            entry.segments = segments.copy()
+        if raster is not None:
+            entry.raster = raster.copy()
+        self._store(key, entry)
+        if self.directory is not None:
+            self._save(key, entry)
+
+    def clear(self, disk: bool = False):
+        self._entries.clear()
+        if disk and self.directory is not None:
+            for name in os.listdir(self.directory):
+                if name.endswith((".npz", ".png")):
+                    os.remove(os.path.join(self.directory, name))
+
+    def get_stats(self):
+        return {"entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses}
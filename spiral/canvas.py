@@ -0,0 +1,409 @@
+import light_widgets.lib as lw
+import pygame as pg
+import numpy as np
+import typing
+import math
+import zlib
+
+
+def draw_line(target, color: pg.Color, start: lw.PosType, end: lw.PosType, width: float = 1):
+    # pygame only draws whole pixel widths, other targets may use the fraction
+    if isinstance(target, pg.Surface):
+        return pg.draw.line(target, color, start, end, int(width))
+    return target.draw_line(color, start, end, width)
+
+
+def _round(value: float) -> int:
+    # pygame rounds clipped endpoints half away from zero
+    return int(value + .5) if 0 <= value else int(value - .5)
+
+
+def _clip_line(start: tuple[int, int], end: tuple[int, int], rect: tuple[int, int, int, int]):
+    # the part of the line inside left, top, right, bottom as (t0, t1), the way pygame clips, None when it misses
+    t0, t1 = 0.0, 1.0
+    for delta, low, high in ((end[0] - start[0], rect[0] - start[0], rect[2] - start[0]),
+                             (end[1] - start[1], rect[1] - start[1], rect[3] - start[1])):
+        if delta == 0:
+            if 0 < low or high < 0:
+                return None
+            continue
+        low, high = low / delta, high / delta
+        if delta < 0:
+            low, high = high, low
+        t0, t1 = max(t0, low), min(t1, high)
+    return (t0, t1) if t0 <= t1 else None
+
+
+def line_spans(start: tuple[int, int], end: tuple[int, int], width: int, size: tuple[int, int]):
+    # the pixels pg.draw.line fills on a surface of size without drawing them, as one span across the thickness
+    # for every row when thick_x or every column otherwise: (thick_x, rows or columns, lows, highs) with lows and
+    # highs inclusive, None for lines wider than the surface that leave it, whose clipping is not known
+    empty = np.zeros(0, np.int64)
+    clipped = _clip_line(start, end, (0, 0, size[0], size[1]))
+    if width < 1 or clipped is None:
+        return True, empty, empty, empty
+    dx, dy = end[0] - start[0], end[1] - start[1]
+    first = (start[0] + _round(dx * clipped[0]), start[1] + _round(dy * clipped[0]))
+    if width == 1:
+        # one pixel lines are clipped at both ends and stepped between the clipped endpoints
+        end = (start[0] + _round(dx * clipped[1]), start[1] + _round(dy * clipped[1]))
+        dx, dy = end[0] - first[0], end[1] - first[1]
+        thick_x = abs(dx) <= abs(dy)
+        half = extra = 0
+        stop = end[1] if thick_x else end[0]
+    else:
+        # thick lines keep stepping like the whole line from the clipped start, and end once their spans
+        # can no longer reach the surface
+        thick_x = abs(dx) <= abs(dy)
+        half, extra = width // 2, 1 - width % 2
+        if (size[0] if thick_x else size[1]) <= half:
+            inside = pg.Rect(0, 0, size[0] + 1, size[1] + 1)
+            if not inside.collidepoint(start) or not inside.collidepoint(end):
+                return None
+            reach = (0, 0, size[0], size[1])
+        elif thick_x:
+            reach = (-half - 1, 0, size[0] + half, size[1])
+        else:
+            reach = (0, -half - 1, size[0], size[1] + half)
+        clipped = _clip_line(start, end, reach)
+        if clipped is None:
+            return True, empty, empty, empty
+        stop = start[1] + _round(dy * clipped[1]) if thick_x else start[0] + _round(dx * clipped[1])
+
+    # bresenham from the clipped start, with the error term of the unclipped line
+    step_x = 1 if first[0] < end[0] else -1
+    step_y = 1 if first[1] < end[1] else -1
+    dx, dy = abs(dx), abs(dy)
+    if dx <= dy:
+        steps = np.arange(abs(stop - first[1]) + 1)
+        moves = -((dy // 2 - steps * dx) // dy) if 0 < dy else np.zeros(len(steps), np.int64)
+        xs, ys = first[0] + step_x * moves, first[1] + step_y * steps
+    else:
+        steps = np.arange(abs(stop - first[0]) + 1)
+        moves = -((dx // 2 - steps * dy) // dx)
+        xs, ys = first[0] + step_x * steps, first[1] + step_y * moves
+
+    majors, centers, across, along = (ys, xs, size[0], size[1]) if thick_x else (xs, ys, size[1], size[0])
+    lows = np.maximum(centers - half + extra, 0)
+    highs = np.minimum(centers + half, across - 1)
+    kept = (0 <= majors) & (majors < along) & (lows <= highs)
+    return thick_x, majors[kept], lows[kept], highs[kept]
+
+
+class TiledCanvas(object):
+    def __init__(self, size: lw.SizeType, tile_size: int = 256, background: pg.Color = lw.WHITE,
+                 scratch_limit: int = 1024 * 1024, region: pg.Rect = None, cold_frames: int = None,
+                 compress_level: int = 1):
+        self._size = lw.Size(size)
+        # tiles outside the region are never created, lines there are skipped
+        self._region = self.get_rect() if region is None else pg.Rect(region).clip(self.get_rect())
+        self._tile_size = tile_size
+        self._background = pg.Color(background)
+        self._tiles: dict[tuple[int, int], pg.Surface] = {}
+        self._touched: set[tuple[int, int]] = set()
+        # tiles drawn on since each consumer last called pop_dirty_keys
+        self._dirty: dict[str, set[tuple[int, int]]] = {}
+        self._scratch: typing.Optional[pg.Surface] = None
+        self._scratch_limit = scratch_limit
+        # tiles nobody used for cold_frames calls of compress_cold are kept zlib compressed until used again
+        self.cold_frames = cold_frames
+        self.compress_level = compress_level
+        self._cold: dict[tuple[int, int], bytes] = {}
+        self._last_used: dict[tuple[int, int], int] = {}
+        self._frame = 0
+        self._stats = {"hits": 0, "misses": 0, "compressed": 0, "decompressed": 0}
+
+    def get_size(self):
+        return tuple(self._size)
+
+    def get_rect(self):
+        return pg.Rect((0, 0), self.get_size())
+
+    def get_tile_size(self):
+        return self._tile_size
+
+    def get_background(self):
+        return self._background
+
+    def get_tile_count(self):
+        return len(self._tiles) + len(self._cold)
+
+    def get_memory(self):
+        return sum(tile.get_width() * tile.get_height() * tile.get_bytesize() for tile in self._tiles.values()) + \
+            sum(len(data) for data in self._cold.values())
+
+    def get_stats(self):
+        # hits found a tile uncompressed, misses had to decompress it first
+        accesses = self._stats["hits"] + self._stats["misses"]
+        return {"hot_tiles": len(self._tiles),
+                "cold_tiles": len(self._cold),
+                "cold_bytes": sum(len(data) for data in self._cold.values()),
+                "cold_raw_bytes": sum(self.get_tile_rect(key).w * self.get_tile_rect(key).h * 3 for key in self._cold),
+                "hit_rate": self._stats["hits"] / accesses if accesses > 0 else 1.0,
+                **self._stats}
+
+    def get_touched_keys(self):
+        return tuple(self._touched)
+
+    def is_touched(self, key: tuple[int, int]):
+        return key in self._touched
+
+    def pop_dirty_keys(self, consumer: str = "default") -> set[tuple[int, int]]:
+        # a consumer starts tracking on its first call, so that call also reports every tile drawn on so far
+        dirty = self._dirty.get(consumer)
+        self._dirty[consumer] = set()
+        return set(self._touched) if dirty is None else dirty
+
+    def _mark_dirty(self, keys: typing.Iterable[tuple[int, int]]):
+        for dirty in self._dirty.values():
+            dirty.update(keys)
+
+    def _touch(self, key: tuple[int, int]):
+        self._touched.add(key)
+        for dirty in self._dirty.values():
+            dirty.add(key)
+
+    def get_tile_rect(self, key: tuple[int, int]):
+        left, top = key[0] * self._tile_size, key[1] * self._tile_size
+        return pg.Rect(left, top, min(self._tile_size, self._size.w - left), min(self._tile_size, self._size.h - top))
+
+    def _decompress(self, key: tuple[int, int]) -> pg.Surface:
+        tile = pg.Surface(self.get_tile_rect(key).size)
+        tile.blit(pg.image.frombytes(zlib.decompress(self._cold[key]), tile.get_size(), "RGB"), (0, 0))
+        return tile
+
+    def get_tile(self, key: tuple[int, int], create: bool = True) -> pg.Surface | None:
+        tile = self._tiles.get(key)
+        if tile is not None:
+            self._stats["hits"] += 1
+        elif key in self._cold:
+            self._stats["misses"] += 1
+            self._stats["decompressed"] += 1
+            tile = self._tiles[key] = self._decompress(key)
+            del self._cold[key]
+        if self.cold_frames is not None:
+            self._last_used[key] = self._frame
+        if tile is None and create:
+            tile = pg.Surface(self.get_tile_rect(key).size)
+            tile.fill(self._background)
+            self._tiles[key] = tile
+        return tile
+
+    def compress_cold(self, visible: pg.Rect = None, limit: int = 8) -> int:
+        # call once a frame, compresses up to limit tiles that were not used for cold_frames frames and are outside
+        # visible, returns how many it compressed
+        self._frame += 1
+        if self.cold_frames is None:
+            return 0
+        compressed = 0
+        for key in list(self._tiles):
+            if limit <= compressed:
+                break
+            if self._frame - self._last_used.get(key, self._frame) < self.cold_frames or \
+                    visible is not None and visible.colliderect(self.get_tile_rect(key)):
+                continue
+            tile = self._tiles.pop(key)
+            if key in self._touched:
+                self._cold[key] = zlib.compress(pg.image.tobytes(tile, "RGB"), self.compress_level)
+            # an untouched tile is only background, it is dropped instead
+            self._last_used.pop(key, None)
+            self._stats["compressed"] += 1
+            compressed += 1
+        return compressed
+
+    def get_region(self):
+        return self._region.copy()
+
+    def get_tile_keys(self, rect: pg.Rect) -> typing.Iterator[tuple[int, int]]:
+        rect = rect.clip(self._region)
+        if rect.w <= 0 or rect.h <= 0:
+            return
+        for y in range(rect.top // self._tile_size, (rect.bottom - 1) // self._tile_size + 1):
+            for x in range(rect.left // self._tile_size, (rect.right - 1) // self._tile_size + 1):
+                yield x, y
+
+    def _get_scratch(self, size: tuple[int, int]) -> pg.Surface:
+        # each side doubles on its own until it fits the line, never past the canvas, and a scratch that would
+        # hold more than four times the limit is made just big enough for this line instead
+        if self._scratch is None or self._scratch.get_width() < size[0] or self._scratch.get_height() < size[1]:
+            old_size = (0, 0) if self._scratch is None else self._scratch.get_size()
+            new_size = tuple(old if needed <= old else max(needed, min(old * 2, limit), self._tile_size)
+                             for needed, old, limit in zip(size, old_size, self.get_size()))
+            if 4 * self._scratch_limit < new_size[0] * new_size[1]:
+                new_size = size
+            self._scratch = pg.Surface(new_size)
+        return self._scratch
+
+    def _get_line_areas(self, start: tuple[int, int], end: tuple[int, int], width: int,
+                        bounds: pg.Rect) -> list[tuple[tuple[int, int], pg.Rect]]:
+        # (key, area) for the tiles the line reaches, the area being the band of the tile within half a width of
+        # the center line, so a long diagonal clears and copies that band and not its whole bounds
+        thick_x = abs(end[0] - start[0]) <= abs(end[1] - start[1])
+        axis = 1 if thick_x else 0
+        if start[axis] == end[axis]:
+            return [(key, self.get_tile_rect(key).clip(bounds)) for key in self.get_tile_keys(bounds)]
+        slope = (end[1 - axis] - start[1 - axis]) / (end[axis] - start[axis])
+        reach = width // 2 + 2
+        lows, highs = sorted((start[axis], end[axis]))
+        areas = []
+        for key in self.get_tile_keys(bounds):
+            tile_rect = self.get_tile_rect(key).clip(bounds)
+            first, last = (tile_rect.top, tile_rect.bottom) if thick_x else (tile_rect.left, tile_rect.right)
+            left, right = (tile_rect.left, tile_rect.right) if thick_x else (tile_rect.top, tile_rect.bottom)
+            first, last = max(first, lows), min(last - 1, highs)
+            centers = (start[1 - axis] + (first - start[axis]) * slope, start[1 - axis] + (last - start[axis]) * slope)
+            left, right = max(left, math.floor(min(centers)) - reach), min(right, math.ceil(max(centers)) + reach + 1)
+            if first <= last and left < right:
+                area = pg.Rect(left, first, right - left, last - first + 1) if thick_x else \
+                    pg.Rect(first, left, last - first + 1, right - left)
+                areas.append((key, area))
+        return areas
+
+    def draw_line(self, color: pg.Color, start: lw.PosType, end: lw.PosType, width: float = 1) -> pg.Rect:
+        start, end = (int(start[0]), int(start[1])), (int(end[0]), int(end[1]))
+        width = int(width)
+        if width < 1:
+            return pg.Rect(start, (0, 0))
+        # pygame spreads a thick line up to width // 2 + 1 pixels off its center line
+        margin = width // 2 + 2
+        bounds = pg.Rect(min(start[0], end[0]) - margin, min(start[1], end[1]) - margin,
+                         abs(end[0] - start[0]) + 2 * margin + 1, abs(end[1] - start[1]) + 2 * margin + 1)
+        bounds = bounds.clip(self.get_rect())
+        if bounds.w <= 0 or bounds.h <= 0 or not bounds.colliderect(self._region):
+            return bounds
+
+        tile_rect = self.get_tile_rect((bounds.x // self._tile_size, bounds.y // self._tile_size))
+        if tile_rect.contains(bounds):
+            drawn = pg.draw.line(self.get_tile((tile_rect.x // self._tile_size, tile_rect.y // self._tile_size)), color,
+                                 (start[0] - tile_rect.x, start[1] - tile_rect.y),
+                                 (end[0] - tile_rect.x, end[1] - tile_rect.y), width)
+            self._touch((tile_rect.x // self._tile_size, tile_rect.y // self._tile_size))
+            return drawn.move(tile_rect.topleft)
+
+        if self._scratch_limit < bounds.w * bounds.h:
+            # too big for the scratch, the spans pygame would fill are worked out and written into the tiles
+            spans = line_spans(start, end, width, self.get_size())
+            if spans is not None:
+                return self._fill_spans(color, *spans)
+
+        # draw unclipped into the scratch surface, pygame only rasterizes the same pixels as one big surface would
+        # when the clip rect is not in the way, then copy the drawn pixels onto the tiles they landed on,
+        # only the bands of the tiles the line reaches are cleared and copied
+        color = pg.Color(color)
+        key_color = pg.Color(255 - color.r, 255 - color.g, 255 - color.b)
+        scratch = self._get_scratch(bounds.size)
+        scratch.set_clip(pg.Rect((0, 0), bounds.size))
+        areas = self._get_line_areas(start, end, width, bounds)
+        for _, area in areas:
+            scratch.fill(key_color, area.move(-bounds.x, -bounds.y))
+        scratch.set_colorkey(key_color)
+        drawn = pg.draw.line(scratch, color, (start[0] - bounds.x, start[1] - bounds.y),
+                             (end[0] - bounds.x, end[1] - bounds.y), width).move(bounds.topleft)
+        for key, area in areas:
+            tile_rect = self.get_tile_rect(key)
+            area = drawn.clip(area)
+            if area.w <= 0 or area.h <= 0:
+                continue
+            self.get_tile(key).blit(scratch, area.move(-tile_rect.x, -tile_rect.y), area.move(-bounds.x, -bounds.y))
+            self._touch(key)
+        return drawn
+
+    def _fill_spans(self, color: pg.Color, thick_x: bool, majors: np.ndarray, lows: np.ndarray,
+                    highs: np.ndarray) -> pg.Rect:
+        if len(majors) == 0:
+            return pg.Rect(0, 0, 0, 0)
+        if majors[-1] < majors[0]:
+            majors, lows, highs = majors[::-1], lows[::-1], highs[::-1]
+        drawn = pg.Rect(int(lows.min()), int(majors[0]), int(highs.max() - lows.min() + 1),
+                        int(majors[-1] - majors[0] + 1))
+        if not thick_x:
+            drawn = pg.Rect(drawn.y, drawn.x, drawn.h, drawn.w)
+        for key in self.get_tile_keys(drawn):
+            tile_rect = self.get_tile_rect(key)
+            (first, end), (left, right) = ((tile_rect.top, tile_rect.bottom), (tile_rect.left, tile_rect.right)) \
+                if thick_x else ((tile_rect.left, tile_rect.right), (tile_rect.top, tile_rect.bottom))
+            head, tail = np.searchsorted(majors, (first, end))
+            tile_lows, tile_highs = np.maximum(lows[head:tail], left), np.minimum(highs[head:tail], right - 1)
+            kept = tile_lows <= tile_highs
+            if not kept.any():
+                continue
+            tile = self.get_tile(key)
+            self._touch(key)
+            if tail - head == end - first and kept.all() and \
+                    tile_lows.max() == left and tile_highs.min() == right - 1:
+                tile.fill(color)
+                continue
+            # pixels are indexed x first, turned for column spans so a span is always pixels[low:high, line]
+            mapped = tile.map_rgb(color)
+            pixels = pg.surfarray.pixels2d(tile) if thick_x else pg.surfarray.pixels2d(tile).T
+            for line, low, high in zip((majors[head:tail][kept] - first).tolist(), (tile_lows[kept] - left).tolist(),
+                                       (tile_highs[kept] - left + 1).tolist()):
+                pixels[low:high, line] = mapped
+            del pixels
+        return drawn
+
+    def clear(self, release: bool = False):
+        if release:
+            self._tiles.clear()
+            self._last_used.clear()
+        else:
+            for key in self._touched:
+                if key in self._tiles:
+                    self._tiles[key].fill(self._background)
+        # compressed tiles that were cleared are just background, nothing worth keeping
+        self._cold.clear()
+        self._mark_dirty(self._touched)
+        self._touched.clear()
+
+    def snapshot(self, base: dict[tuple[int, int], pg.Surface] = None,
+                 changed: set[tuple[int, int]] = None) -> dict[tuple[int, int], pg.Surface]:
+        # tiles outside changed are shared with base instead of copied, snapshots must never be drawn on
+        snapshot = {}
+        for key in self._touched:
+            if base is not None and changed is not None and key in base and key not in changed:
+                snapshot[key] = base[key]
+            else:
+                snapshot[key] = self.get_tile(key).copy()
+        return snapshot
+
+    def restore(self, snapshot: dict[tuple[int, int], pg.Surface]):
+        for key in self._touched - snapshot.keys():
+            if key in self._cold:
+                del self._cold[key]
+            else:
+                self._tiles[key].fill(self._background)
+        for key, tile in snapshot.items():
+            self.get_tile(key).blit(tile, (0, 0))
+        self._mark_dirty(self._touched | snapshot.keys())
+        self._touched = set(snapshot.keys())
+
+    def render(self, display: pg.Surface, pos: lw.PosType = (0, 0)):
+        viewport = display.get_rect().move(-int(pos[0]), -int(pos[1]))
+        display.fill(self._background, self.get_rect().move(pos).clip(display.get_rect()))
+        for key in self.get_tile_keys(viewport):
+            if key in self._touched:
+                display.blit(self.get_tile(key), self.get_tile_rect(key).move(pos))
+
+    def render_keys(self, display: pg.Surface, pos: lw.PosType,
+                    keys: typing.Iterable[tuple[int, int]]) -> list[pg.Rect]:
+        # redraws only the given tiles, returns the display rects that changed for pg.display.update
+        rects = []
+        for key in keys:
+            tile_rect = self.get_tile_rect(key).move(pos)
+            rect = tile_rect.clip(display.get_rect())
+            if rect.w <= 0 or rect.h <= 0:
+                continue
+            if key in self._touched:
+                display.blit(self.get_tile(key), rect, rect.move(-tile_rect.x, -tile_rect.y))
+            else:
+                display.fill(self._background, rect)
+            rects.append(rect)
+        return rects
+
+    def to_surface(self) -> pg.Surface:
+        surf = pg.Surface(self.get_size())
+        surf.fill(self._background)
+        for key in self._touched:
+            # cold tiles are read without being kept uncompressed
+            surf.blit(self._tiles[key] if key in self._tiles else self._decompress(key), self.get_tile_rect(key))
+        return surf
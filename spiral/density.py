@@ -0,0 +1,120 @@
+from spiral.kernel import *
+from spiral.segments import SegmentBuffer
+
+
+def _clip_segments(starts: np.ndarray, ends: np.ndarray, size: tuple[int, int]) -> tuple[np.ndarray, np.ndarray,
+                                                                                            np.ndarray]:
+    # the parts of the segments inside [0, w] x [0, h], and which segments have one
+    deltas = ends - starts
+    low, high = np.zeros(len(starts)), np.ones(len(starts))
+    inside = np.ones(len(starts), dtype=bool)
+    for axis, limit in ((0, size[0]), (1, size[1])):
+        for p, q in ((-deltas[:, axis], starts[:, axis]), (deltas[:, axis], limit - starts[:, axis])):
+            parallel = p == 0
+            inside &= ~parallel | (0 <= q)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                ratio = np.where(parallel, 0.0, q / np.where(parallel, 1.0, p))
+            low = np.where(~parallel & (p < 0), np.maximum(low, ratio), low)
+            high = np.where(~parallel & (0 < p), np.minimum(high, ratio), high)
+    inside &= low <= high
+    return starts + deltas * low[:, None], starts + deltas * high[:, None], inside
+
+
+class DensityCanvas(object):
+    def __init__(self, size: lw.SizeType, background: pg.Color = lw.WHITE, spacing: float = .5,
+                 weigh_widths: bool = False, max_samples: int = 1 << 20, batch_size: int = 65536, scale: float = 1.0):
+        # a draw_line target that adds up how much line passes through every pixel instead of painting over it,
+        # the lines are sampled every spacing pixels along their length, colors are averaged by that coverage,
+        # with weigh_widths a line counts as much as its pixel width, lines pygame would not draw are skipped,
+        # positions are multiplied by scale first so a run bigger than the canvas can be shrunk onto it
+        self.size = lw.Size(size)
+        self.scale = scale
+        self.background = pg.Color(background)
+        self.spacing = spacing
+        self.weigh_widths = weigh_widths
+        self.max_samples = max_samples
+        self.batch_size = batch_size
+        self.segments = 0
+        self._density = np.zeros(self.size.w * self.size.h, dtype=np.float32)
+        self._colors = np.zeros((3, self.size.w * self.size.h), dtype=np.float32)
+        self._queue = SegmentBuffer(batch_size)
+
+    def get_memory(self):
+        return self._density.nbytes + self._colors.nbytes
+
+    def draw_line(self, color: pg.Color, start: lw.PosType, end: lw.PosType, width: float = 1):
+        self._queue.append(start, end, width, color)
+        if self.batch_size <= len(self._queue):
+            self.flush()
+
+    def flush(self):
+        if len(self._queue) > 0:
+            queue = self._queue
+            self.add_segments(queue.starts, queue.ends, queue.thicknesses, queue.colors)
+            queue.clear()
+
+    def add_segments(self, starts: np.ndarray, ends: np.ndarray, widths: np.ndarray, colors: np.ndarray):
+        widths = widths.astype(np.int64)
+        visible = widths >= 1
+        starts, ends, inside = _clip_segments(starts[visible] * self.scale, ends[visible] * self.scale,
+                                              tuple(self.size))
+        self.segments += int(visible.sum())
+        starts, ends = starts[inside], ends[inside]
+        weights = widths[visible][inside].astype(np.float64) if self.weigh_widths else np.ones(len(starts))
+        colors = colors[visible][inside, :3].astype(np.float64)
+        lengths = np.hypot(*(ends - starts).T)
+        counts = np.maximum(np.ceil(lengths / self.spacing), 1).astype(np.int64)
+        # every sample carries its share of the length, a zero length line still marks its pixel once
+        weights = weights * np.maximum(lengths, 1) / counts
+        # a few segments at a time so the samples never outgrow max_samples
+        ends_at = np.cumsum(counts)
+        first = 0
+        while first < len(counts):
+            last = max(int(np.searchsorted(ends_at, ends_at[first] - counts[first] + self.max_samples, "right")),
+                       first + 1)
+            self._add_samples(starts[first:last], ends[first:last], counts[first:last], weights[first:last],
+                              colors[first:last])
+            first = last
+
+    def _add_samples(self, starts: np.ndarray, ends: np.ndarray, counts: np.ndarray, weights: np.ndarray,
+                     colors: np.ndarray):
+        owners = np.repeat(np.arange(len(counts)), counts)
+        offsets = np.cumsum(counts) - counts
+        steps = (np.arange(len(owners)) - offsets[owners] + .5) / counts[owners]
+        points = starts[owners] + (ends - starts)[owners] * steps[:, None]
+        xs = np.minimum(points[:, 0].astype(np.int64), self.size.w - 1)
+        ys = np.minimum(points[:, 1].astype(np.int64), self.size.h - 1)
+        pixels = ys * self.size.w + xs
+        # only the span of pixels the samples landed in is counted, not the whole canvas
+        low, high = int(pixels.min()), int(pixels.max()) + 1
+        pixels -= low
+        sample_weights = weights[owners]
+        self._density[low:high] += np.bincount(pixels, sample_weights, high - low).astype(np.float32)
+        for channel in range(3):
+            self._colors[channel, low:high] += np.bincount(pixels, sample_weights * colors[owners, channel],
+                                                           high - low).astype(np.float32)
+
+    def get_density(self) -> np.ndarray:
+        self.flush()
+        return self._density.reshape(self.size.h, self.size.w)
+
+    def to_surface(self, exposure: float = 1.0, gamma: float = 1.0) -> pg.Surface:
+        # log tone mapping, the densest pixel gets the full average color of the lines through it, empty pixels the
+        # background, callable at any point of the run
+        self.flush()
+        density = self._density.astype(np.float64)
+        peak = density.max()
+        alpha = np.zeros_like(density) if peak <= 0 else np.log1p(density * exposure) / np.log1p(peak * exposure)
+        alpha **= 1 / gamma
+        colors = self._colors / np.maximum(density, 1e-12)
+        background = np.array(tuple(self.background)[:3], dtype=np.float64)
+        pixels = background[:, None] + (colors - background[:, None]) * alpha
+        pixels = np.clip(np.rint(pixels), 0, 255).astype(np.uint8).reshape(3, self.size.h, self.size.w)
+        return pg.surfarray.make_surface(pixels.transpose(2, 1, 0))
+
+
+def accumulate_density(program: Program, canvas: DensityCanvas, first: int, last: int, start: lw.PosType = (0, 0),
+                       chunk: int = 65536):
+    # segments [first, last) of the run a chunk at a time, so only the canvas grows with the picture
+    for _, path in iter_chunks(program, first, last, start, chunk=chunk):
+        canvas.add_segments(path.starts, path.ends, path.thicknesses, path.colors)
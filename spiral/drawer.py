@@ -0,0 +1,45 @@
+from spiral.segments import SegmentBuffer
+from spiral.canvas import draw_line
+import light_widgets.lib as lw
+import pygame as pg
+import math
+
+
+DEGREES = 0
+RADIANS = 1
+
+
+class LineDrawer(object):
+    def __init__(self, start: lw.PosType, angle: float, color: pg.Color, surface: pg.Surface, mode=DEGREES,
+                 segments: SegmentBuffer = None):
+        self.original_vars = {"start": lw.Pos(start),
+                              "angle": angle,
+                              "color": color}
+        self.start = lw.Pos(start)
+        self.end = lw.Pos(0, 0)
+        self.angle = angle
+        self.color = color
+        self.surf = surface
+        self.mode = mode
+        self.segments = segments
+
+    def reset(self):
+        self.start = self.original_vars["start"].copy()
+        self.end = lw.Pos(0, 0)
+        self.angle = self.original_vars["angle"]
+        self.color = pg.Color(self.original_vars["color"])
+
+    def rotate(self, angle):
+        self.angle += angle
+        while self.angle < 0:
+            self.angle += 360 if self.mode == DEGREES else 2 * math.pi
+        while (360 if self.mode == DEGREES else 2 * math.pi) <= self.angle:
+            self.angle -= 360 if self.mode == DEGREES else 2 * math.pi
+
+    def forward(self, mag, thick):
+        self.end = self.start + (mag * math.cos(math.radians(self.angle) if self.mode == DEGREES else self.angle),
+                                 mag * math.sin(math.radians(self.angle) if self.mode == DEGREES else self.angle))
+        draw_line(self.surf, self.color, self.start, self.end, thick)
+        if self.segments is not None:
+            self.segments.append(self.start, self.end, thick, self.color)
+        self.start = self.end
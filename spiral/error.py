@@ -0,0 +1,2 @@
+class SpiralError(Exception):
+    pass
@@ -0,0 +1,136 @@
+from spiral.kernel import *
+from spiral.headless import DISPLAY_SIZE, fit_canvas
+import subprocess
+import abc
+import threading
+import typing
+import queue
+import os
+
+
+class FrameWriter(abc.ABC):
+    def __init__(self, max_queue: int = 8):
+        # frames wait here as raw RGB bytes, a full queue holds the renderer back instead of growing
+        self._queue: queue.Queue = queue.Queue(max_queue)
+        self._error: typing.Optional[BaseException] = None
+        self.frames = 0
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            if self._error is None:
+                try:
+                    self._write_frame(*item)
+                except BaseException as error:
+                    # keep draining so the renderer never waits on a dead writer, the error surfaces on write/close
+                    self._error = error
+        if self._error is None:
+            try:
+                self._finish()
+            except BaseException as error:
+                self._error = error
+
+    def _check(self):
+        if self._error is not None:
+            raise SpiralError(f"Frame writer failed: {self._error!r}") from self._error
+
+    @abc.abstractmethod
+    def _write_frame(self, index: int, data: bytes, size: tuple[int, int]):
+        pass
+
+    def _finish(self):
+        pass
+
+    def write(self, surface: pg.Surface):
+        self._check()
+        self._queue.put((self.frames, pg.image.tobytes(surface, "RGB"), surface.get_size()))
+        self.frames += 1
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        self._check()
+
+
+class PngSequenceWriter(FrameWriter):
+    def __init__(self, directory: str, pattern: str = "frame_{:06d}.png", max_queue: int = 8):
+        self.directory = directory
+        self.pattern = pattern
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+        super().__init__(max_queue)
+
+    def _write_frame(self, index: int, data: bytes, size: tuple[int, int]):
+        pg.image.save(pg.image.frombytes(data, size, "RGB"), os.path.join(self.directory, self.pattern.format(index)))
+
+
+class RawVideoWriter(FrameWriter):
+    def __init__(self, path: str = None, command: list[str] = None, max_queue: int = 8):
+        # raw rgb24 frames into a file, or into the stdin of an encoder such as ffmpeg_command() gives
+        if (path is None) == (command is None):
+            raise SpiralError("RawVideoWriter needs either a path or a command")
+        self._process = None
+        if command is not None:
+            self._process = subprocess.Popen(command, stdin=subprocess.PIPE)
+            self._stream = self._process.stdin
+        else:
+            self._stream = open(path, "wb")
+        super().__init__(max_queue)
+
+    def _write_frame(self, index: int, data: bytes, size: tuple[int, int]):
+        self._stream.write(data)
+
+    def _finish(self):
+        self._stream.close()
+        if self._process is not None and self._process.wait() != 0:
+            raise SpiralError(f"Encoder exited with code {self._process.returncode}")
+
+
+def ffmpeg_command(path: str, size: lw.SizeType, fps: float = 30, executable: str = "ffmpeg") -> list[str]:
+    size = lw.Size(size)
+    return [executable, "-y", "-loglevel", "error", "-f", "rawvideo", "-pix_fmt", "rgb24",
+            "-s", f"{size.w}x{size.h}", "-r", str(fps), "-i", "-",
+            # yuv420p needs even sizes, a fitted canvas can have odd ones
+            "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", "-pix_fmt", "yuv420p", path]
+
+
+def export_frames(program: Program, writer: FrameWriter, every: int, steps: int = None,
+                  size: lw.SizeType = None, background: pg.Color = lw.WHITE, chunk: int = 65536,
+                  start: lw.PosType = None):
+    # one frame per every segments and one for the finished run, on a canvas fitted to the whole run
+    # or with the run started at start on size, its center without one, DISPLAY_SIZE gives the view main() shows
+    # while animating, a size and start fit_canvas already gave skip fitting again,
+    # the path is computed a chunk at a time so memory does not grow with the run
+    if steps is None:
+        steps = program.default_steps(DISPLAY_SIZE)
+    every = max(every, 1)
+    if size is None:
+        size, start = fit_canvas(program, steps)
+    else:
+        size = lw.Size(size)
+        start = size / 2 if start is None else lw.Pos(start)
+    total = steps * len(program)
+    surf = pg.Surface(size)
+    surf.fill(background)
+    for first, path in iter_chunks(program, 0, total, start, chunk=chunk):
+        last = first + len(path)
+        drawn = first
+        # frames land on multiples of every, counted over the whole run
+        for frame_end in range((first // every + 1) * every, last + 1, every):
+            draw_path(path, surf, drawn - first, frame_end - first)
+            drawn = frame_end
+            writer.write(surf)
+        draw_path(path, surf, drawn - first)
+    if total % every != 0 or total == 0:
+        writer.write(surf)
@@ -0,0 +1,94 @@
+from spiral.kernel import *
+from spiral.parallel import rasterize_parallel
+from spiral.raster import draw_segments
+from spiral.density import DensityCanvas, accumulate_density
+from spiral.cache import ResultCache
+from spiral.segments import SegmentBuffer
+import light_widgets.lib as lw
+import math
+
+
+DISPLAY_SIZE = lw.Size(1300, 800)
+CANVAS_SIZE = DISPLAY_SIZE * 10
+
+
+def fit_canvas(program: Program, steps: int = None, window: tuple[int, int] = None) -> tuple[lw.Size, lw.Pos]:
+    # the smallest canvas the run draws on and where the turtle starts on it, from a geometry-only prepass
+    if steps is None:
+        steps = program.default_steps(DISPLAY_SIZE)
+    first, last = (0, steps * len(program)) if window is None else (window[0], min(window[1], steps * len(program)))
+    bounds = compute_bounds(program, first, last)
+    if bounds is None:
+        return lw.Size(1, 1), lw.Pos(0, 0)
+    # moving the start changes how the positions round, so the run is measured again where it will be drawn
+    # until nothing of it falls left of or above the canvas
+    start = lw.Pos(-bounds.x, -bounds.y)
+    for _ in range(4):
+        bounds = compute_bounds(program, first, last, start)
+        if 0 <= bounds.x and 0 <= bounds.y:
+            break
+        start = lw.Pos(start.x - min(bounds.x, 0), start.y - min(bounds.y, 0))
+    return lw.Size(max(bounds.right, 1), max(bounds.bottom, 1)), start
+
+
+def render(program: Program, steps: int = None, size: lw.SizeType = None,
+           background: pg.Color = lw.WHITE, processes: int = None, cache: ResultCache = None,
+           window: tuple[int, int] = None, antialias: bool = False, density: bool = False) -> pg.Surface:
+    # without a size the canvas is fitted to the run, otherwise the run starts at the center of the given size,
+    # a fitted density canvas is scaled down to DISPLAY_SIZE since density is meant for runs far too big to hold
+    if steps is None:
+        steps = program.default_steps(DISPLAY_SIZE)
+    key = None
+    if cache is not None:
+        # keyed on the size asked for, a fitted size follows from the rest, so a hit skips the fitting prepass
+        key = ResultCache.make_key(program, steps, None if size is None else tuple(lw.Size(size)),
+                                   tuple(pg.Color(background)), window, antialias, density)
+        entry = cache.get(key)
+        if entry is not None and entry.raster is not None:
+            return entry.raster.copy()
+    fitted = size is None
+    if fitted:
+        size, start = fit_canvas(program, steps, window)
+    else:
+        size = lw.Size(size)
+        start = size / 2
+
+    first, last = (0, steps * len(program)) if window is None else (window[0], min(window[1], steps * len(program)))
+    if density:
+        # coverage added up and tone mapped instead of painted over, the path is never held whole
+        scale = min(DISPLAY_SIZE.w / size.w, DISPLAY_SIZE.h / size.h, 1.0) if fitted else 1.0
+        canvas = DensityCanvas((max(math.ceil(size.w * scale), 1), max(math.ceil(size.h * scale), 1)), background,
+                               scale=scale)
+        accumulate_density(program, canvas, first, last, start)
+        surf = canvas.to_surface()
+        if cache is not None:
+            cache.put(key, raster=surf)
+        return surf
+
+    if window is None:
+        path = compute_path(program, steps, start)
+    else:
+        # only the segments [first, last) of the run, the turtle jumps straight to the first one
+        path = compute_segments(program, first, last, start)
+    if antialias:
+        # fractional widths blended over each other, always on one surface
+        surf = pg.Surface(size)
+        surf.fill(background)
+        draw_segments(surf, path.starts, path.ends, path.thicknesses, path.colors)
+    elif processes is not None:
+        surf = rasterize_parallel(path, size, background, processes=processes)
+    else:
+        surf = pg.Surface(size)
+        surf.fill(background)
+        draw_path(path, surf)
+    if cache is not None:
+        segments = SegmentBuffer(max(len(path), 1))
+        segments.extend(path.starts, path.ends, path.thicknesses, path.colors)
+        cache.put(key, segments, surf)
+    return surf
+
+
+def render_to_file(program: Program, path: str, steps: int = None, size: lw.SizeType = None,
+                   background: pg.Color = lw.WHITE, processes: int = None, cache: ResultCache = None,
+                   window: tuple[int, int] = None, antialias: bool = False, density: bool = False):
+    pg.image.save(render(program, steps, size, background, processes, cache, window, antialias, density), path)
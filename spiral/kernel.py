@@ -0,0 +1,126 @@
+from spiral.program import *
+from spiral.drawer import DEGREES
+from spiral.seek import seek, TurtleState
+from spiral.canvas import draw_line
+import light_widgets.lib as lw
+import pygame as pg
+import numpy as np
+import itertools
+import typing
+import math
+
+
+class Path(object):
+    def __init__(self, starts: np.ndarray, ends: np.ndarray, thicknesses: np.ndarray, colors: np.ndarray,
+                 angle: float = 0.0, magnitude: float = 0.0, thickness: float = 1.0):
+        self.starts = starts
+        self.ends = ends
+        self.thicknesses = thicknesses
+        self.colors = colors
+        # turtle state after the last segment, the same values LineDrawer and execute() end with
+        self.angle = angle
+        self.magnitude = magnitude
+        self.thickness = thickness
+
+    def __len__(self):
+        return len(self.starts)
+
+    def get_state(self, segment: int) -> TurtleState:
+        # the state the next path starts from, segment is the index this path ends at within the run
+        return TurtleState(segment, tuple(self.ends[-1]), self.angle, self.magnitude, self.thickness)
+
+
+def compute_segments(program: Program, first: int, last: int, start: lw.PosType = (0, 0), angle: float = 0.0,
+                     mode: int = DEGREES, state: TurtleState = None) -> Path:
+    # segments [first, last) of the run, started from the closed-form state so nothing before first is simulated,
+    # or from a state carried over from the path before it to continue that path exactly
+    if state is None:
+        state = seek(program, first, start, angle, mode)
+    count = max(last - first, 0)
+    full_turn = 360 if mode == DEGREES else 2 * math.pi
+    order = (np.arange(count) + first) % len(program)
+    d_mag = np.array([instruction.magnitude for instruction in program])[order]
+    d_thick = np.array([instruction.thickness for instruction in program])[order]
+    d_angle = np.array([instruction.angle for instruction in program])[order]
+    colors = np.array([tuple(instruction.color) for instruction in program], dtype=np.uint8)[order]
+
+    # values used by segment i are the sums of the increments of every segment before it,
+    # each led by the starting value so they accumulate in the same order as LineDrawer
+    magnitudes = np.empty(count + 1)
+    magnitudes[0] = state.magnitude
+    magnitudes[1:] = d_mag
+    np.cumsum(magnitudes, out=magnitudes)
+    thicknesses = np.empty(count + 1)
+    thicknesses[0] = state.thickness
+    thicknesses[1:] = d_thick
+    np.cumsum(thicknesses, out=thicknesses)
+    angles = np.empty(count + 1)
+    angles[0] = state.angle
+    angles[1:] = d_angle
+    np.cumsum(angles, out=angles)
+    np.mod(angles, full_turn, out=angles)
+
+    radians = np.radians(angles[:-1]) if mode == DEGREES else angles[:-1]
+    # the start point leads the cumsum so positions accumulate in the same order as Pos.__add__
+    points = np.empty((count + 1, 2))
+    points[0] = tuple(state.position)
+    points[1:, 0] = magnitudes[:-1] * np.cos(radians)
+    points[1:, 1] = magnitudes[:-1] * np.sin(radians)
+    np.cumsum(points, axis=0, out=points)
+
+    return Path(points[:-1], points[1:], thicknesses[:-1], colors,
+                float(angles[-1]), float(magnitudes[-1]), float(thicknesses[-1]))
+
+
+def compute_path(program: Program, steps: int, start: lw.PosType = (0, 0), angle: float = 0.0,
+                 mode: int = DEGREES) -> Path:
+    return compute_segments(program, 0, steps * len(program), start, angle, mode)
+
+
+def iter_chunks(program: Program, first: int, last: int | None, start: lw.PosType = (0, 0), angle: float = 0.0,
+                mode: int = DEGREES, chunk: int = 65536) -> typing.Iterator[tuple[int, Path]]:
+    # segments [first, last) as (chunk first, path) of at most chunk segments, each path continues exactly where
+    # the one before it ended so only one chunk is in memory at a time, without last the run never ends
+    chunk = max(chunk, 1)
+    chunk_firsts = itertools.count(first, chunk) if last is None else range(first, last, chunk)
+    state = None
+    for chunk_first in chunk_firsts:
+        chunk_last = chunk_first + chunk if last is None else min(chunk_first + chunk, last)
+        path = compute_segments(program, chunk_first, chunk_last, start, angle, mode, state)
+        state = path.get_state(chunk_last)
+        yield chunk_first, path
+
+
+def compute_bounds(program: Program, first: int, last: int, start: lw.PosType = (0, 0), angle: float = 0.0,
+                   mode: int = DEGREES, chunk: int = 65536) -> pg.Rect | None:
+    # pixels segments [first, last) can draw on, without drawing them, None when every line is thinner than a pixel,
+    # endpoints are floored, which is what pygame's truncation does once the start moves the run onto the canvas
+    bounds = None
+    for _, path in iter_chunks(program, first, last, start, angle, mode, chunk):
+        widths = path.thicknesses.astype(np.int64)
+        drawn = widths >= 1
+        if not drawn.any():
+            continue
+        # pygame spreads a thick line across its thickness axis only, x when it is at least as tall as it is wide,
+        # width // 2 pixels past the high side and one less past the low side when the width is even
+        widths = widths[drawn]
+        starts, ends = np.floor(path.starts[drawn]), np.floor(path.ends[drawn])
+        deltas = np.abs(ends - starts)
+        thick = np.stack((deltas[:, 0] <= deltas[:, 1], deltas[:, 1] < deltas[:, 0]), axis=1)
+        high_margins = np.where(thick, (widths // 2)[:, None], 0)
+        low_margins = np.where(thick, (widths // 2 - (1 - widths % 2))[:, None], 0)
+        lows = (np.minimum(starts, ends) - low_margins).min(axis=0).astype(np.int64)
+        highs = (np.maximum(starts, ends) + high_margins).max(axis=0).astype(np.int64)
+        rect = pg.Rect(int(lows[0]), int(lows[1]), int(highs[0] - lows[0] + 1), int(highs[1] - lows[1] + 1))
+        bounds = rect if bounds is None else bounds.union(rect)
+    return bounds
+
+
+def draw_path(path: Path, surface, first: int = 0, last: int = None):
+    last = len(path) if last is None else last
+    starts = path.starts[first:last].tolist()
+    ends = path.ends[first:last].tolist()
+    widths = path.thicknesses[first:last].astype(np.int64).tolist()
+    colors = path.colors[first:last].tolist()
+    for start, end, width, color in zip(starts, ends, widths, colors):
+        draw_line(surface, color, start, end, width)
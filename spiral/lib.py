@@ -0,0 +1,22 @@
+from spiral.error import *
+from spiral.canvas import *
+from spiral.segments import *
+from spiral.drawer import *
+from spiral.program import *
+from spiral.seek import *
+from spiral.kernel import *
+from spiral.raster import *
+from spiral.density import *
+from spiral.parallel import *
+from spiral.cache import *
+from spiral.scheduler import *
+from spiral.viewer import *
+from spiral.pyramid import *
+from spiral.timeline import *
+from spiral.worker import *
+from spiral.stream import *
+from spiral.headless import *
+from spiral.export import *
+from spiral.vector import *
+from spiral.poster import *
+from spiral.sweep import *
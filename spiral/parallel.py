@@ -0,0 +1,127 @@
+from spiral.kernel import *
+from spiral.canvas import TiledCanvas
+from multiprocessing import shared_memory
+import multiprocessing
+import multiprocessing.pool
+import contextlib
+import signal
+import typing
+import os
+
+
+# <editor-fold desc="Worker Pool Functions">
+__WORKER_STATE: dict = {}
+
+
+def get_worker_state() -> dict:
+    # the state the pool was started with, inside one of worker_pool's workers
+    return __WORKER_STATE
+
+
+def _init_worker(state: dict, initializer: typing.Callable | None):
+    # workers forked after pg.init() inherit SDL's SIGTERM handler, which would make them ignore terminate()
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    __WORKER_STATE.clear()
+    __WORKER_STATE.update(state)
+    if initializer is not None:
+        initializer(__WORKER_STATE)
+
+
+@contextlib.contextmanager
+def worker_pool(processes: int = None, initializer: typing.Callable = None,
+                **state) -> typing.Iterator[multiprocessing.pool.Pool]:
+    # forked where possible so the workers inherit the state instead of unpickling it, initializer(state) runs
+    # once in each worker, the pool is closed and joined once the block is done and only terminated on errors
+    context = multiprocessing.get_context("fork" if "fork" in multiprocessing.get_all_start_methods() else None)
+    pool = context.Pool(processes or os.cpu_count(), _init_worker, (state, initializer))
+    try:
+        yield pool
+    except BaseException:
+        pool.terminate()
+        raise
+    else:
+        pool.close()
+    finally:
+        pool.join()
+# </editor-fold>
+
+
+def bin_segments(path: Path, size: lw.SizeType, tile_size: int) -> dict[tuple[int, int], np.ndarray]:
+    size = lw.Size(size)
+    columns, rows = -(-size.w // tile_size), -(-size.h // tile_size)
+    # same integer bounds TiledCanvas.draw_line uses, so a segment lands in every tile it can draw on
+    starts, ends = path.starts.astype(np.int64), path.ends.astype(np.int64)
+    widths = path.thicknesses.astype(np.int64)
+    margins = widths // 2 + 2
+    lows = np.minimum(starts, ends) - margins[:, None]
+    highs = np.maximum(starts, ends) + margins[:, None]
+    visible = (widths >= 1) & (highs[:, 0] >= 0) & (highs[:, 1] >= 0) & (lows[:, 0] < size.w) & (lows[:, 1] < size.h)
+    indices = np.flatnonzero(visible)
+    first = np.clip(lows[indices] // tile_size, 0, (columns - 1, rows - 1))
+    last = np.clip(highs[indices] // tile_size, 0, (columns - 1, rows - 1))
+    spans = last - first + 1
+    counts = spans[:, 0] * spans[:, 1]
+
+    # one (segment, tile) pair per tile a segment's bounds cover, then grouped by tile in drawing order
+    pair_segments = np.repeat(indices, counts)
+    local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    span_x = np.repeat(spans[:, 0], counts)
+    tile_x = np.repeat(first[:, 0], counts) + local % span_x
+    tile_y = np.repeat(first[:, 1], counts) + local // span_x
+    tile_ids = tile_y * columns + tile_x
+    order = np.argsort(tile_ids, kind="stable")
+    tile_ids, pair_segments = tile_ids[order], pair_segments[order]
+    ids, splits = np.unique(tile_ids, return_index=True)
+    return {(int(tile_id % columns), int(tile_id // columns)): group
+            for tile_id, group in zip(ids, np.split(pair_segments, splits[1:]))}
+
+
+def _attach_pixels(state: dict):
+    shm = shared_memory.SharedMemory(name=state["shm_name"])
+    size = state["size"]
+    state.update(shm=shm, pixels=np.ndarray((size[1], size[0], 4), dtype=np.uint8, buffer=shm.buf))
+
+
+def _render_job(job: tuple[tuple[int, int], np.ndarray]):
+    key, indices = job
+    state = get_worker_state()
+    job_size = state["job_size"]
+    region = pg.Rect(key[0] * job_size, key[1] * job_size, job_size, job_size)
+    canvas = TiledCanvas(state["size"], state["tile_size"], state["background"], state["scratch_limit"], region)
+    path: Path = state["path"]
+    for start, end, width, color in zip(path.starts[indices].tolist(), path.ends[indices].tolist(),
+                                        path.thicknesses[indices].astype(np.int64).tolist(),
+                                        path.colors[indices].tolist()):
+        canvas.draw_line(color, start, end, width)
+    for tile_key in canvas.get_touched_keys():
+        rect = canvas.get_tile_rect(tile_key)
+        tile_bytes = pg.image.tobytes(canvas.get_tile(tile_key), "RGBA")
+        state["pixels"][rect.top:rect.bottom, rect.left:rect.right] = \
+            np.frombuffer(tile_bytes, dtype=np.uint8).reshape(rect.h, rect.w, 4)
+    return key
+
+
+def rasterize_parallel(path: Path, size: lw.SizeType, background: pg.Color = lw.WHITE, tile_size: int = 256,
+                       job_size: int = 1024, processes: int = None, scratch_limit: int = 1024 * 1024) -> pg.Surface:
+    # jobs cover whole canvas tiles so no tile is drawn by two workers, the pixels match one surface exactly
+    job_size = max(job_size // tile_size, 1) * tile_size
+    size = tuple(lw.Size(size))
+    background = tuple(pg.Color(background))
+    shm = shared_memory.SharedMemory(create=True, size=size[0] * size[1] * 4)
+    try:
+        pixels = np.ndarray((size[1], size[0], 4), dtype=np.uint8, buffer=shm.buf)
+        pixels[:] = background
+        jobs = list(bin_segments(path, size, job_size).items())
+        # busiest jobs first so one long job does not finish last on its own
+        jobs.sort(key=lambda job: len(job[1]), reverse=True)
+        with worker_pool(processes, _attach_pixels, shm_name=shm.name, size=size, tile_size=tile_size,
+                         job_size=job_size, background=background, scratch_limit=scratch_limit, path=path) as pool:
+            for _ in pool.imap_unordered(_render_job, jobs):
+                pass
+        del pixels
+        surf = pg.Surface(size)
+        surf.blit(pg.image.frombytes(bytes(shm.buf), size, "RGBX"), (0, 0))
+        return surf
+    finally:
+        shm.close()
+        shm.unlink()
@@ -0,0 +1,89 @@
+from spiral.kernel import *
+from spiral.headless import DISPLAY_SIZE, fit_canvas
+from spiral.canvas import TiledCanvas
+import struct
+import zlib
+
+
+class PngWriter(object):
+    def __init__(self, path: str, size: lw.SizeType, level: int = 6):
+        # writes an rgb png a band of rows at a time, only the compressor's window is kept in memory
+        self.size = lw.Size(size)
+        self.rows = 0
+        self._file = open(path, "wb")
+        self._compressor = zlib.compressobj(level)
+        self._file.write(b"\x89PNG\r\n\x1a\n")
+        self._write_chunk(b"IHDR", struct.pack(">IIBBBBB", self.size.w, self.size.h, 8, 2, 0, 0, 0))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+        else:
+            # the error that stopped the rows matters more than the unfinished file
+            self._file.close()
+
+    def _write_chunk(self, kind: bytes, data: bytes):
+        self._file.write(struct.pack(">I", len(data)) + kind + data +
+                         struct.pack(">I", zlib.crc32(data, zlib.crc32(kind))))
+
+    def write_rows(self, surface: pg.Surface):
+        if surface.get_width() != self.size.w:
+            raise SpiralError(f"Rows are {surface.get_width()} pixels wide, the image is {self.size.w}")
+        if self.size.h < self.rows + surface.get_height():
+            raise SpiralError(f"The image only has {self.size.h} rows")
+        rows = np.frombuffer(pg.image.tobytes(surface, "RGB"), np.uint8).reshape(surface.get_height(), -1)
+        # every row starts with its filter type, 0 leaves the row as it is
+        data = np.zeros((len(rows), rows.shape[1] + 1), np.uint8)
+        data[:, 1:] = rows
+        compressed = self._compressor.compress(data.tobytes())
+        if compressed:
+            self._write_chunk(b"IDAT", compressed)
+        self.rows += len(rows)
+
+    def close(self):
+        if self._file.closed:
+            return
+        if self.rows != self.size.h:
+            self._file.close()
+            raise SpiralError(f"Only {self.rows} of {self.size.h} rows were written")
+        self._write_chunk(b"IDAT", self._compressor.flush())
+        self._write_chunk(b"IEND", b"")
+        self._file.close()
+
+
+def export_poster(program: Program, path: str, steps: int = None, size: lw.SizeType = None,
+                  background: pg.Color = lw.WHITE, band_height: int = 1024, tile_size: int = 256,
+                  chunk: int = 65536):
+    # the run drawn a band of rows at a time into a png, each band only creates the canvas tiles inside it and
+    # only draws the segments that reach it, so memory follows the band and not the poster,
+    # the canvas clips lines the way one poster sized surface would, the bands only decide which tiles exist
+    if steps is None:
+        steps = program.default_steps(DISPLAY_SIZE)
+    if size is None:
+        size, start = fit_canvas(program, steps)
+    else:
+        size = lw.Size(size)
+        start = size / 2
+    total = steps * len(program)
+    # whole tiles per band so no tile is shared between two bands
+    band_height = max(band_height // tile_size, 1) * tile_size
+    band = pg.Surface((size.w, band_height))
+    with PngWriter(path, size) as writer:
+        for top in range(0, size.h, band_height):
+            height = min(band_height, size.h - top)
+            canvas = TiledCanvas(size, tile_size, background, region=pg.Rect(0, top, size.w, height))
+            for _, segments in iter_chunks(program, 0, total, start, chunk=chunk):
+                # at least the margins compute_bounds gives a line, floored like pygame truncates them once on canvas
+                margins = segments.thicknesses.astype(np.int64) // 2 + 2
+                lows = np.floor(np.minimum(segments.starts[:, 1], segments.ends[:, 1])) - margins
+                highs = np.floor(np.maximum(segments.starts[:, 1], segments.ends[:, 1])) + margins
+                hits = np.flatnonzero((lows < top + height) & (top <= highs) & (1 <= segments.thicknesses))
+                if len(hits) > 0:
+                    draw_path(Path(segments.starts[hits], segments.ends[hits], segments.thicknesses[hits],
+                                   segments.colors[hits]), canvas)
+            rows = band.subsurface((0, 0, size.w, height))
+            canvas.render(rows, (0, -top))
+            writer.write_rows(rows)
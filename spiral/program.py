@@ -0,0 +1,103 @@
+from spiral.error import SpiralError
+from spiral.drawer import LineDrawer
+import light_widgets.lib as lw
+import pygame as pg
+import typing
+import hashlib
+import json
+
+
+class Instruction(object):
+    def __init__(self, magnitude: float, thickness: float, angle: float, color: pg.Color | typing.Sequence[int]):
+        self.magnitude = float(magnitude)
+        self.thickness = float(thickness)
+        self.angle = float(angle)
+        self.color = pg.Color(color)
+
+    def __copy__(self):
+        return type(self)(self.magnitude, self.thickness, self.angle, self.color)
+
+    def copy(self):
+        return self.__copy__()
+
+    def to_dict(self):
+        return {"magnitude": self.magnitude,
+                "thickness": self.thickness,
+                "angle": self.angle,
+                "color": list(self.color)}
+
+    @classmethod
+    def from_dict(cls, values: dict):
+        try:
+            return cls(values["magnitude"], values["thickness"], values["angle"], values["color"])
+        except KeyError as e:
+            raise SpiralError(f"Instruction is missing the value {e}")
+
+
+class Program(object):
+    def __init__(self, instructions: typing.Iterable[Instruction]):
+        self._instructions: tuple[Instruction, ...] = tuple(instruction.copy() for instruction in instructions)
+        if len(self._instructions) == 0:
+            raise SpiralError("A program needs at least one instruction")
+        self._table = tuple((instruction.magnitude, instruction.thickness, instruction.angle, instruction.color)
+                            for instruction in self._instructions)
+
+    def __len__(self):
+        return len(self._instructions)
+
+    def __getitem__(self, item):
+        return self._instructions[item]
+
+    def __iter__(self):
+        for instruction in self._instructions:
+            yield instruction
+
+    def get_table(self) -> tuple[tuple[float, float, float, pg.Color], ...]:
+        return self._table
+
+    def get_digest(self):
+        return hashlib.sha256(json.dumps(self.to_dict(), sort_keys=True).encode()).hexdigest()
+
+    def default_steps(self, display_size: typing.Sequence[int]):
+        return int(min(display_size) * len(self))
+
+    def to_dict(self):
+        return {"instructions": [instruction.to_dict() for instruction in self._instructions]}
+
+    @classmethod
+    def from_dict(cls, values: dict):
+        return cls(Instruction.from_dict(instruction) for instruction in values["instructions"])
+
+    def save(self, path: str):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=4)
+
+    @classmethod
+    def load(cls, path: str):
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+
+def animate(program: Program, line_drawer: LineDrawer, steps: int):
+    table = program.get_table()
+    magnitude, thickness = 0, 1
+    for _ in range(steps):
+        for d_mag, d_thick, d_angle, color in table:
+            line_drawer.color = color
+            line_drawer.forward(magnitude, thickness)
+            magnitude += d_mag
+            thickness += d_thick
+            line_drawer.rotate(d_angle)
+            yield
+
+
+def execute(program: Program, line_drawer: LineDrawer, steps: int):
+    for _ in animate(program, line_drawer, steps):
+        pass
+
+
+# programs made fresh on every call, default is what main() fills the instruction sets with
+PRESETS = {"default": lambda: Program(Instruction(.25, .025, (118, -57, 160, 0)[i % 4],
+                                                  (lw.RED, lw.GREEN, lw.BLUE)[i // 4]) for i in range(12)),
+           "square": lambda: Program([Instruction(.5, .01, 90, lw.BLUE)]),
+           "star": lambda: Program([Instruction(.3, .02, 144, lw.RED), Instruction(.1, .005, -3, lw.BLUE)])}
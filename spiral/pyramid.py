@@ -0,0 +1,115 @@
+from spiral.canvas import *
+import math
+
+
+class CanvasPyramid(object):
+    def __init__(self, canvas: TiledCanvas, consumer: str = "pyramid"):
+        # level n halves the canvas n times, every level is tiled like the canvas and only holds tiles with
+        # something drawn below them, level 0 is the canvas itself
+        self.canvas = canvas
+        self._consumer = consumer
+        self._tile_size = canvas.get_tile_size()
+        size = canvas.get_size()
+        self._level_count = max(math.ceil(math.log2(max(max(size) / self._tile_size, 1))), 0) + 1
+        self._levels: list[dict[tuple[int, int], pg.Surface]] = [{} for _ in range(self._level_count)]
+
+    def get_level_count(self):
+        return self._level_count
+
+    def get_level_size(self, level: int) -> lw.Size:
+        scale = 2 ** level
+        size = self.canvas.get_size()
+        return lw.Size(-(-size[0] // scale), -(-size[1] // scale))
+
+    def get_level(self, zoom: float) -> int:
+        # the smallest level that is still at least as detailed as the screen, drawn shrunk by at most half
+        if zoom >= 1:
+            return 0
+        return min(int(math.floor(math.log2(1 / zoom) + 1e-9)), self._level_count - 1)
+
+    def get_memory(self):
+        return sum(tile.get_width() * tile.get_height() * tile.get_bytesize()
+                   for level in self._levels[1:] for tile in level.values())
+
+    def _get_tile_rect(self, level: int, key: tuple[int, int]) -> pg.Rect:
+        size = self.get_level_size(level)
+        left, top = key[0] * self._tile_size, key[1] * self._tile_size
+        return pg.Rect(left, top, min(self._tile_size, size.w - left), min(self._tile_size, size.h - top))
+
+    def get_tile(self, level: int, key: tuple[int, int]) -> pg.Surface | None:
+        if level == 0:
+            return self.canvas.get_tile(key, False) if self.canvas.is_touched(key) else None
+        return self._levels[level].get(key)
+
+    def _build_tile(self, level: int, key: tuple[int, int]):
+        tile = None
+        half = self._tile_size // 2
+        for y in (0, 1):
+            for x in (0, 1):
+                child = self.get_tile(level - 1, (key[0] * 2 + x, key[1] * 2 + y))
+                if child is None:
+                    continue
+                if tile is None:
+                    tile = self._levels[level].get(key)
+                    if tile is None:
+                        tile = pg.Surface(self._get_tile_rect(level, key).size)
+                    tile.fill(self.canvas.get_background())
+                size = (max((child.get_width() + 1) // 2, 1), max((child.get_height() + 1) // 2, 1))
+                tile.blit(pg.transform.smoothscale(child, size), (x * half, y * half))
+        if tile is None:
+            # everything below was cleared
+            self._levels[level].pop(key, None)
+        else:
+            self._levels[level][key] = tile
+
+    def update(self) -> list[set[tuple[int, int]]]:
+        # rebuilds only the tiles above the canvas tiles drawn on since the last update,
+        # returns the keys that changed on each level
+        keys = self.canvas.pop_dirty_keys(self._consumer)
+        changed = [keys]
+        for level in range(1, self._level_count):
+            keys = set((x // 2, y // 2) for x, y in keys)
+            for key in keys:
+                self._build_tile(level, key)
+            changed.append(keys)
+        return changed
+
+    def render(self, display: pg.Surface, center: lw.PosType, zoom: float,
+               keys: typing.Iterable[tuple[int, int]] = None) -> list[pg.Rect]:
+        # shows the canvas around center at zoom from the matching level, only the given keys of that level
+        # when there are any, returns the display rects that changed for pg.display.update
+        level = self.get_level(zoom)
+        scale = zoom * 2 ** level
+        origin = lw.Pos(display.get_size()) / 2 - lw.Pos(center) * zoom
+        size = self.get_level_size(level)
+        rects = []
+        if keys is None:
+            view = pg.Rect(int((-origin.x) // scale), int((-origin.y) // scale),
+                           int(display.get_width() / scale) + 2, int(display.get_height() / scale) + 2)
+            view = view.clip(pg.Rect((0, 0), size))
+            display.fill(self.canvas.get_background())
+            rects.append(display.get_rect())
+            if view.w <= 0 or view.h <= 0:
+                return rects
+            keys = [(x, y) for y in range(view.top // self._tile_size, (view.bottom - 1) // self._tile_size + 1)
+                    for x in range(view.left // self._tile_size, (view.right - 1) // self._tile_size + 1)]
+            keys = [key for key in keys if self.get_tile(level, key) is not None]
+        for key in keys:
+            tile_rect = self._get_tile_rect(level, key)
+            # whole pixel edges shared with the neighbours so scaled tiles neither overlap nor leave gaps
+            left, top = math.floor(origin.x + tile_rect.left * scale), math.floor(origin.y + tile_rect.top * scale)
+            right = math.floor(origin.x + tile_rect.right * scale)
+            bottom = math.floor(origin.y + tile_rect.bottom * scale)
+            dest = pg.Rect(left, top, right - left, bottom - top)
+            rect = dest.clip(display.get_rect())
+            if rect.w <= 0 or rect.h <= 0:
+                continue
+            tile = self.get_tile(level, key)
+            if tile is None:
+                display.fill(self.canvas.get_background(), rect)
+            elif dest.size == tile.get_size():
+                display.blit(tile, dest)
+            else:
+                display.blit(pg.transform.scale(tile, dest.size), dest)
+            rects.append(rect)
+        return rects
@@ -0,0 +1,195 @@
+from spiral.segments import SegmentBuffer
+import light_widgets.lib as lw
+import pygame as pg
+import numpy as np
+
+
+ROUND = 0
+MITER = 1
+
+
+def _get_rows(starts: np.ndarray, ends: np.ndarray, radii: np.ndarray, joined: np.ndarray, join: int,
+              miter_limit: float, size: tuple[int, int]):
+    # every segment as a capsule a pixel wider than its line, plus a square around each miter corner
+    owners = np.arange(len(starts))
+    firsts, lasts, reach = starts, ends, radii + 1
+    if join == MITER:
+        corners = np.flatnonzero(joined)
+        owners = np.concatenate((owners, corners))
+        firsts = np.concatenate((firsts, ends[corners]))
+        lasts = np.concatenate((lasts, ends[corners]))
+        reach = np.concatenate((reach, radii[corners] * miter_limit + 1))
+
+    # one entry per pixel row a shape crosses, spanning the columns of the band around the center line there
+    tops = np.maximum(np.floor(np.minimum(firsts[:, 1], lasts[:, 1]) - reach), 0).astype(np.int64)
+    bottoms = np.minimum(np.floor(np.maximum(firsts[:, 1], lasts[:, 1]) + reach), size[1] - 1).astype(np.int64)
+    heights = np.maximum(bottoms - tops + 1, 0)
+    shapes = np.repeat(np.arange(len(owners)), heights)
+    ys = tops[shapes] + np.arange(heights.sum()) - np.repeat(np.cumsum(heights) - heights, heights)
+    deltas = lasts - firsts
+    lengths = np.hypot(*deltas.T)
+    slope = np.abs(deltas[:, 1]) / np.maximum(lengths, 1e-12)
+    half_band = reach / np.maximum(slope, 1e-12)
+    centers = firsts[shapes, 0] + (ys + 0.5 - firsts[shapes, 1]) * deltas[shapes, 0] / \
+        np.where(deltas[shapes, 1] == 0, 1, deltas[shapes, 1])
+    lefts = np.floor(np.maximum(centers - half_band[shapes],
+                                np.minimum(firsts[shapes, 0], lasts[shapes, 0]) - reach[shapes]))
+    rights = np.floor(np.minimum(centers + half_band[shapes],
+                                 np.maximum(firsts[shapes, 0], lasts[shapes, 0]) + reach[shapes]))
+    lefts = np.maximum(lefts, 0).astype(np.int64)
+    rights = np.minimum(rights, size[0] - 1).astype(np.int64)
+    order = np.argsort(owners[shapes], kind="stable")
+    return owners[shapes][order], ys[order], lefts[order], np.maximum(rights - lefts + 1, 0)[order]
+
+
+def _get_coverage(owners: np.ndarray, ys: np.ndarray, lefts: np.ndarray, spans: np.ndarray, offsets: np.ndarray,
+                  starts: np.ndarray, ends: np.ndarray, radii: np.ndarray, joined: np.ndarray,
+                  next_directions: np.ndarray, join: int, miter_limit: float) -> np.ndarray:
+    deltas = ends - starts
+    lengths = np.hypot(*deltas.T)
+    directions = np.where(lengths[:, None] > 0, deltas / np.maximum(lengths, 1e-12)[:, None], (1.0, 0.0))
+    # distances along and across the segment are linear along a row, found for its first pixel center
+    # and stepped across the row by the segment direction
+    qx, qy = lefts + 0.5 - starts[owners, 0], ys + 0.5 - starts[owners, 1]
+    dx, dy = directions[owners, 0], directions[owners, 1]
+    along = np.repeat(qx * dx + qy * dy - lengths[owners] / 2, spans) + offsets * np.repeat(dx, spans)
+    across = np.repeat(qx * dy - qy * dx, spans) + offsets * np.repeat(dy, spans)
+    radius, half_length = np.repeat(radii[owners], spans), np.repeat(lengths[owners] / 2, spans)
+    if join == ROUND:
+        beyond = np.maximum(np.abs(along) - half_length, 0)
+        return np.clip(radius + 0.5 - np.sqrt(across * across + beyond * beyond), 0, 1)
+
+    coverage = np.clip(0.5 - np.maximum(np.abs(across) - radius, np.abs(along) - half_length), 0, 1)
+    corner = np.flatnonzero(joined[owners])
+    if len(corner) > 0:
+        # the miter fills what lies past the end of this segment and before the start of the next,
+        # within a half width of both center lines
+        pixels = np.flatnonzero(np.repeat(joined[owners], spans))
+        corner_spans = spans[corner]
+        cx = np.repeat(qx[corner] - deltas[owners[corner], 0], corner_spans) + offsets[pixels]
+        cy = np.repeat(qy[corner] - deltas[owners[corner], 1], corner_spans)
+        nx = np.repeat(next_directions[owners[corner], 0], corner_spans)
+        ny = np.repeat(next_directions[owners[corner], 1], corner_spans)
+        distance = np.maximum.reduce((np.abs(across[pixels]) - radius[pixels],
+                                      np.abs(cx * ny - cy * nx) - radius[pixels],
+                                      half_length[pixels] - along[pixels], cx * nx + cy * ny,
+                                      np.sqrt(cx * cx + cy * cy) - radius[pixels] * miter_limit))
+        coverage[pixels] = np.maximum(coverage[pixels], np.clip(0.5 - distance, 0, 1))
+    return coverage
+
+
+def draw_segments(surface: pg.Surface, starts: np.ndarray, ends: np.ndarray, widths: np.ndarray,
+                  colors: np.ndarray, join: int = ROUND, miter_limit: float = 4.0, following: lw.PosType = None,
+                  max_pixels: int = 1 << 22):
+    # anti-aliased segments with fractional widths, composited over each other in drawing order, for output where
+    # quality counts more than time, every pixel a line may touch is worked out in numpy for the whole batch at
+    # once, which for lines wider than a few pixels costs about a hundred times what pg.draw.line does,
+    # following is the end of the segment drawn after the last one, to miter the last corner
+    starts, ends = np.asarray(starts, dtype=np.float64), np.asarray(ends, dtype=np.float64)
+    widths, colors = np.asarray(widths, dtype=np.float64), np.asarray(colors)[:, :3].astype(np.float64)
+    keep = np.flatnonzero(widths > 0)
+    if len(keep) == 0:
+        return
+    radii = widths / 2
+    joined = np.zeros(len(starts), dtype=bool)
+    next_directions = np.zeros((len(starts), 2))
+    if join == MITER:
+        next_deltas = np.empty((len(starts), 2))
+        next_deltas[:-1] = ends[1:] - starts[1:]
+        joined[:-1] = np.all(np.abs(starts[1:] - ends[:-1]) < 1e-9, axis=1)
+        if following is None:
+            next_deltas[-1] = 0
+        else:
+            next_deltas[-1] = np.asarray(tuple(following), dtype=np.float64) - ends[-1]
+            joined[-1] = True
+        next_lengths = np.hypot(*next_deltas.T)
+        joined &= next_lengths > 0
+        next_directions = next_deltas / np.maximum(next_lengths, 1e-12)[:, None]
+    starts, ends, radii, joined = starts[keep], ends[keep], radii[keep], joined[keep]
+    colors, next_directions = colors[keep], next_directions[keep]
+
+    width, height = surface.get_size()
+    owners, ys, lefts, spans = _get_rows(starts, ends, radii, joined, join, miter_limit, (width, height))
+    per_segment = np.bincount(owners, weights=spans, minlength=len(starts))
+
+    pixels = pg.surfarray.pixels3d(surface)
+    try:
+        # segments in chunks of about max_pixels candidate pixels, each chunk composited over the last
+        first = 0
+        while first < len(starts):
+            total = np.cumsum(per_segment[first:])
+            last = first + max(int(np.searchsorted(total, max_pixels, side="right")), 1)
+            row_first, row_last = np.searchsorted(owners, (first, last))
+            _composite(pixels, owners[row_first:row_last], ys[row_first:row_last], lefts[row_first:row_last],
+                       spans[row_first:row_last], width, starts, ends, radii, joined, next_directions, colors, join,
+                       miter_limit)
+            first = last
+    finally:
+        del pixels
+
+
+def _composite(pixels: np.ndarray, owners: np.ndarray, ys: np.ndarray, lefts: np.ndarray, spans: np.ndarray,
+               width: int, starts: np.ndarray, ends: np.ndarray, radii: np.ndarray, joined: np.ndarray,
+               next_directions: np.ndarray, colors: np.ndarray, join: int, miter_limit: float):
+    if spans.sum() == 0:
+        return
+    offsets = np.arange(spans.sum()) - np.repeat(np.cumsum(spans) - spans, spans)
+    alphas = _get_coverage(owners, ys, lefts, spans, offsets, starts, ends, radii, joined, next_directions, join,
+                           miter_limit)
+    ids = np.repeat(ys * width + lefts, spans) + offsets
+    owners = np.repeat(owners, spans)
+    drawn = np.flatnonzero(alphas > 0)
+    if len(drawn) == 0:
+        return
+
+    # one entry per pixel and segment, pixels grouped with their segments in drawing order,
+    # a miter corner overlapping its own segment gives the same pixel twice
+    order = drawn[np.argsort(ids[drawn], kind="stable")]
+    ids, owners, alphas = ids[order], owners[order], alphas[order]
+    unique = np.ones(len(ids), dtype=bool)
+    unique[1:] = (ids[1:] != ids[:-1]) | (owners[1:] != owners[:-1])
+    if not unique.all():
+        ids, owners, alphas = ids[unique], owners[unique], alphas[unique]
+
+    # over operator per pixel in closed form instead of one layer at a time, each segment counts with its coverage
+    # times what the segments drawn over it let through, the background with what all of them let through,
+    # the products running as sums of logs over each pixel's entries
+    groups = np.flatnonzero(np.concatenate(((True,), ids[1:] != ids[:-1])))
+    sizes = np.diff(np.append(groups, len(ids)))
+    through = np.concatenate(((0,), np.cumsum(np.log(np.maximum(1 - alphas, 1e-6)))))
+    weights = alphas * np.exp(np.repeat(through[groups + sizes], sizes) - through[1:])
+    xs, ys = ids[groups] % width, ids[groups] // width
+    result = pixels[xs, ys] * np.exp(through[groups + sizes] - through[groups])[:, None]
+    for channel, values in enumerate(np.ascontiguousarray(colors.T)):
+        result[:, channel] += np.add.reduceat(values[owners] * weights, groups)
+    pixels[xs, ys] = np.rint(result).astype(np.uint8)
+
+
+class LineBatch(object):
+    def __init__(self, surface: pg.Surface, join: int = ROUND, miter_limit: float = 4.0, batch_size: int = 4096):
+        # a draw_line target that queues segments and rasterizes them together, call flush once the run ends
+        self.surface = surface
+        self.join = join
+        self.miter_limit = miter_limit
+        self.batch_size = batch_size
+        self._queue = SegmentBuffer(batch_size + 1)
+
+    def __len__(self):
+        return len(self._queue)
+
+    def draw_line(self, color: pg.Color, start: lw.PosType, end: lw.PosType, width: float = 1):
+        self._queue.append(start, end, width, color)
+        if self.batch_size < len(self._queue):
+            self.flush(False)
+
+    def flush(self, final: bool = True):
+        # the newest segment waits for the next one unless this is the end, so its miter knows where to go
+        count = len(self._queue) if final else len(self._queue) - 1
+        if count <= 0:
+            return
+        queue = self._queue
+        draw_segments(self.surface, queue.starts[:count], queue.ends[:count], queue.thicknesses[:count],
+                      queue.colors[:count], self.join, self.miter_limit,
+                      None if final else tuple(queue.ends[count]))
+        self._queue = SegmentBuffer(self.batch_size + 1)
+        self._queue.extend(queue.starts[count:], queue.ends[count:], queue.thicknesses[count:], queue.colors[count:])
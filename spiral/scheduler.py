@@ -0,0 +1,55 @@
+import typing
+import time
+
+
+# what a coroutine yields instead of drawing when it has nothing ready yet, the frame goes on without it
+WAITING = object()
+
+
+class FrameScheduler(object):
+    def __init__(self, budget_ms: float = 12.0, min_segments: int = 1):
+        self.budget_ms = budget_ms
+        self.min_segments = max(min_segments, 1)
+        self.reset()
+
+    def reset(self):
+        self.frames = 0
+        self.segments = 0
+        self.last_segments = 0
+        self.last_ms = 0.0
+        self.total_ms = 0.0
+        self.over_budget = 0
+
+    def advance(self, coroutine: typing.Iterator) -> bool:
+        start = time.perf_counter()
+        deadline = start + self.budget_ms / 1000
+        count = 0
+        finished = False
+        now = start
+        try:
+            # stop once the average cost of this frame's segments would carry the next one past the deadline
+            while count < self.min_segments or now + (now - start) / count < deadline:
+                if next(coroutine) is WAITING:
+                    break
+                count += 1
+                now = time.perf_counter()
+        except StopIteration:
+            finished = True
+        self.last_ms = (time.perf_counter() - start) * 1000
+        self.last_segments = count
+        self.frames += 1
+        self.segments += count
+        self.total_ms += self.last_ms
+        if self.budget_ms < self.last_ms:
+            self.over_budget += 1
+        return finished
+
+    def get_stats(self):
+        return {"budget_ms": self.budget_ms,
+                "frames": self.frames,
+                "segments": self.segments,
+                "last_segments": self.last_segments,
+                "last_ms": self.last_ms,
+                "segments_per_frame": self.segments / self.frames if self.frames > 0 else 0.0,
+                "segments_per_ms": self.segments / self.total_ms if self.total_ms > 0 else 0.0,
+                "over_budget_frames": self.over_budget}
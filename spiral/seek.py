@@ -0,0 +1,78 @@
+from spiral.program import *
+from spiral.drawer import DEGREES
+import light_widgets.lib as lw
+import cmath
+import math
+
+
+class TurtleState(object):
+    def __init__(self, segment: int, position: lw.PosType, angle: float, magnitude: float, thickness: float):
+        # everything LineDrawer and animate() hold right before drawing the given segment
+        self.segment = segment
+        self.position = lw.Pos(position)
+        self.angle = angle
+        self.magnitude = magnitude
+        self.thickness = thickness
+
+    def __copy__(self):
+        return type(self)(self.segment, self.position.copy(), self.angle, self.magnitude, self.thickness)
+
+    def copy(self):
+        return self.__copy__()
+
+    def __str__(self):
+        return f"TurtleState(segment: {self.segment}, position: {self.position}, angle: {self.angle}, " \
+               f"magnitude: {self.magnitude}, thickness: {self.thickness})"
+
+
+def _geometric_sums(turn: float, cycles: int) -> tuple[complex, complex]:
+    # sum(z^c) and sum(c * z^c) for c in [0, cycles) with z = e^(i turn), in O(log cycles) steps that double the
+    # cycles summed so far, [0, 2m) being [0, m) and z^m times it shifted by m, then add the next cycle when the bit
+    # says so, the closed form (1 - z^n) / (1 - z) cancels away its precision for turns close to a full one
+    plain, ramped, count = 0j, 0j, 0
+    for bit in bin(cycles)[2:]:
+        power = cmath.exp(1j * turn * count)
+        plain, ramped = plain + power * plain, ramped + power * (ramped + count * plain)
+        count *= 2
+        if bit == "1":
+            power = cmath.exp(1j * turn * count)
+            plain, ramped = plain + power, ramped + count * power
+            count += 1
+    return plain, ramped
+
+
+def seek(program: Program, segment: int, start: lw.PosType = (0, 0), angle: float = 0.0,
+         mode: int = DEGREES) -> TurtleState:
+    if segment < 0:
+        raise SpiralError("Cannot seek to a negative segment")
+    full_turn = 360 if mode == DEGREES else 2 * math.pi
+    to_radians = math.radians if mode == DEGREES else float
+    cycles, rest = divmod(segment, len(program))
+    table = program.get_table()
+
+    # within one cycle instruction j is drawn with the prefix sums of the increments before it
+    cycle_mag = cycle_thick = cycle_angle = 0.0
+    directions, weighted = 0j, 0j
+    for d_mag, d_thick, d_angle, _ in table:
+        direction = cmath.exp(1j * to_radians(angle + cycle_angle))
+        directions += direction
+        weighted += cycle_mag * direction
+        cycle_mag += d_mag
+        cycle_thick += d_thick
+        cycle_angle += d_angle
+
+    # cycle c adds z^c * (c * cycle_mag * directions + weighted), summed in closed form over the full cycles
+    # the exact remainder keeps a turn close to a full one small, it would lose digits in radians otherwise
+    cycle_turn = math.remainder(cycle_angle, full_turn)
+    plain, ramped = _geometric_sums(to_radians(cycle_turn), cycles)
+    position = complex(*tuple(start)) + cycle_mag * directions * ramped + weighted * plain
+
+    magnitude = cycles * cycle_mag
+    thickness = 1 + cycles * cycle_thick
+    current_angle = angle + math.fmod(cycles * cycle_turn, full_turn)
+    for d_mag, d_thick, d_angle, _ in table[:rest]:
+        position += magnitude * cmath.exp(1j * to_radians(current_angle))
+        magnitude += d_mag
+        thickness += d_thick
+        current_angle += d_angle
+    return TurtleState(segment, (position.real, position.imag), current_angle % full_turn, magnitude, thickness)
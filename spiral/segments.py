@@ -0,0 +1,143 @@
+from spiral.canvas import draw_line
+import light_widgets.lib as lw
+import pygame as pg
+import numpy as np
+
+
+class SegmentBuffer(object):
+    def __init__(self, capacity: int = 1024):
+        self._count = 0
+        self._lines = np.empty((capacity, 4))
+        self._thicknesses = np.empty(capacity)
+        self._colors = np.empty((capacity, 4), dtype=np.uint8)
+
+    def __len__(self):
+        return self._count
+
+    def _reserve(self, count: int):
+        if count <= len(self._lines):
+            return
+        capacity = max(count, len(self._lines) * 2)
+        for name in ("_lines", "_thicknesses", "_colors"):
+            old = getattr(self, name)
+            new = np.empty((capacity, *old.shape[1:]), dtype=old.dtype)
+            new[:self._count] = old[:self._count]
+            setattr(self, name, new)
+
+    def __copy__(self):
+        new_buffer = type(self)(max(self._count, 1))
+        new_buffer.extend(self.starts, self.ends, self.thicknesses, self.colors)
+        return new_buffer
+
+    def copy(self):
+        return self.__copy__()
+
+    def clear(self):
+        self._count = 0
+
+    def append(self, start: lw.PosType, end: lw.PosType, thickness: float, color: pg.Color):
+        self._reserve(self._count + 1)
+        self._lines[self._count] = (start[0], start[1], end[0], end[1])
+        self._thicknesses[self._count] = thickness
+        self._colors[self._count] = tuple(pg.Color(color))
+        self._count += 1
+
+    def extend(self, starts: np.ndarray, ends: np.ndarray, thicknesses: np.ndarray, colors: np.ndarray):
+        count = len(starts)
+        self._reserve(self._count + count)
+        self._lines[self._count:self._count + count, :2] = starts
+        self._lines[self._count:self._count + count, 2:] = ends
+        self._thicknesses[self._count:self._count + count] = thicknesses
+        self._colors[self._count:self._count + count] = colors
+        self._count += count
+
+    @property
+    def starts(self):
+        return self._lines[:self._count, :2]
+
+    @property
+    def ends(self):
+        return self._lines[:self._count, 2:]
+
+    @property
+    def thicknesses(self):
+        return self._thicknesses[:self._count]
+
+    @property
+    def colors(self):
+        return self._colors[:self._count]
+
+    def get_bounds(self, first: int = 0, last: int = None) -> pg.Rect | None:
+        last = self._count if last is None else min(last, self._count)
+        if last <= first:
+            return None
+        lines = self._lines[first:last]
+        margin = self._thicknesses[first:last] / 2 + 2
+        left = np.minimum(lines[:, 0], lines[:, 2]) - margin
+        top = np.minimum(lines[:, 1], lines[:, 3]) - margin
+        right = np.maximum(lines[:, 0], lines[:, 2]) + margin
+        bottom = np.maximum(lines[:, 1], lines[:, 3]) + margin
+        return pg.Rect(int(np.floor(left.min())), int(np.floor(top.min())),
+                       int(np.ceil(right.max() - left.min())), int(np.ceil(bottom.max() - top.min())))
+
+    def query(self, rect: pg.Rect, first: int = 0, last: int = None) -> np.ndarray:
+        last = self._count if last is None else min(last, self._count)
+        lines = self._lines[first:last]
+        margin = self._thicknesses[first:last] / 2 + 2
+        # bounding boxes of the segments against the rect, in drawing order
+        hits = (np.minimum(lines[:, 0], lines[:, 2]) - margin < rect.right) & \
+               (rect.left < np.maximum(lines[:, 0], lines[:, 2]) + margin) & \
+               (np.minimum(lines[:, 1], lines[:, 3]) - margin < rect.bottom) & \
+               (rect.top < np.maximum(lines[:, 1], lines[:, 3]) + margin)
+        return np.flatnonzero(hits) + first
+
+
+class SegmentRing(SegmentBuffer):
+    def __init__(self, keep: int = 65536):
+        # keeps at least the last keep segments and never more than twice that, the oldest half is dropped in one
+        # move once the buffer is full so appending stays cheap, indices shift when that happens
+        super().__init__(max(keep, 1) * 2)
+        self.keep = max(keep, 1)
+        self.dropped = 0
+
+    def __copy__(self):
+        new_buffer = type(self)(self.keep)
+        new_buffer.extend(self.starts, self.ends, self.thicknesses, self.colors)
+        return new_buffer
+
+    def _trim(self, count: int):
+        if self._count + count <= len(self._lines):
+            return
+        kept = min(max(self.keep - count, 0), self._count)
+        for name in ("_lines", "_thicknesses", "_colors"):
+            array = getattr(self, name)
+            array[:kept] = array[self._count - kept:self._count]
+        self.dropped += self._count - kept
+        self._count = kept
+
+    def clear(self):
+        super().clear()
+        self.dropped = 0
+
+    def append(self, start: lw.PosType, end: lw.PosType, thickness: float, color: pg.Color):
+        self._trim(1)
+        super().append(start, end, thickness, color)
+
+    def extend(self, starts: np.ndarray, ends: np.ndarray, thicknesses: np.ndarray, colors: np.ndarray):
+        if self.keep < len(starts):
+            self.dropped += len(starts) - self.keep
+            starts, ends = starts[-self.keep:], ends[-self.keep:]
+            thicknesses, colors = thicknesses[-self.keep:], colors[-self.keep:]
+        self._trim(len(starts))
+        super().extend(starts, ends, thicknesses, colors)
+
+
+def replay(segments: SegmentBuffer, surface, first: int = 0, last: int = None):
+    last = len(segments) if last is None else min(last, len(segments))
+    starts = segments.starts[first:last].tolist()
+    ends = segments.ends[first:last].tolist()
+    widths = segments.thicknesses[first:last].astype(np.int64).tolist()
+    colors = segments.colors[first:last].tolist()
+    for start, end, width, color in zip(starts, ends, widths, colors):
+        draw_line(surface, color, start, end, width)
+        yield
@@ -0,0 +1,124 @@
+from spiral.segments import *
+import math
+import time
+
+
+class StreamCanvas(object):
+    def __init__(self, size: lw.SizeType, background: pg.Color = lw.WHITE, keep: int = 65536, fade: float = 0.0,
+                 fade_every: int = 1024, margin: float = .2, repaint_budget: float = .01):
+        # a window onto an endless run that follows the turtle, memory stays the same however long it runs:
+        # one window sized surface and a ring of the last keep segments, which repaints the parts the window
+        # scrolls onto, with fade the window is blended towards the background every fade_every segments
+        # so older lines wear away, repainting is skipped then since it would bring faded lines back at full strength,
+        # a repaint only draws as many of the newest segments it finds as fit in repaint_budget seconds, once lines
+        # grow longer and wider than the window nearly all of them cross it, the newest lines then cover the older
+        # ones there anyway, the window follows the turtle in render so it moves and repaints at most once a frame
+        # however many segments were drawn since
+        self._size = lw.Size(size)
+        self._background = pg.Color(background)
+        self._surf = pg.Surface(self._size)
+        self._surf.fill(self._background)
+        self._fade_surf = pg.Surface(self._size)
+        self._fade_surf.fill(self._background)
+        self._scratch = pg.Surface(self._size)
+        self.fade = fade
+        self.fade_every = max(fade_every, 1)
+        self.margin = margin
+        self.repaint_budget = repaint_budget
+        # seconds a repainted line took lately, 0 until one was
+        self._line_cost = 0.0
+        self.segments = SegmentRing(keep)
+        # world position of the top left corner of the window
+        self._origin = lw.Pos(0, 0)
+        # end of the newest segment, the window is centered on it in render once it leaves the inner rect
+        self._head = None
+        self._since_fade = 0
+        self._changed = True
+
+    def get_size(self):
+        return tuple(self._size)
+
+    def get_origin(self):
+        return self._origin.copy()
+
+    def get_surface(self):
+        return self._surf
+
+    def get_memory(self):
+        ring = self.segments._lines.nbytes + self.segments._thicknesses.nbytes + self.segments._colors.nbytes
+        return ring + 3 * self._size.w * self._size.h * self._surf.get_bytesize()
+
+    def _get_inner_rect(self) -> pg.Rect:
+        margin_x, margin_y = int(self._size.w * self.margin), int(self._size.h * self.margin)
+        return pg.Rect(self._origin.x + margin_x, self._origin.y + margin_y,
+                       self._size.w - 2 * margin_x, self._size.h - 2 * margin_y)
+
+    def _repaint(self, rect: pg.Rect):
+        # rect is in window coordinates
+        if 0 < self.fade:
+            self._surf.fill(self._background, rect)
+            return
+        origin = np.array(tuple(self._origin))
+        indices = self.segments.query(rect.move(self._origin.x, self._origin.y))
+        if 0 < self._line_cost:
+            indices = indices[-max(int(self.repaint_budget / self._line_cost), 1):]
+        starts = (np.floor(self.segments.starts[indices]) - origin).astype(np.int64).tolist()
+        ends = (np.floor(self.segments.ends[indices]) - origin).astype(np.int64).tolist()
+        widths = self.segments.thicknesses[indices].astype(np.int64).tolist()
+        colors = self.segments.colors[indices].tolist()
+        # drawn whole on the scratch and copied, a clip rect would move the pixels of thick lines that cross it
+        self._scratch.fill(self._background, rect)
+        start_time = time.perf_counter()
+        for start, end, width, color in zip(starts, ends, widths, colors):
+            pg.draw.line(self._scratch, color, start, end, width)
+        if 0 < len(indices):
+            cost = (time.perf_counter() - start_time) / len(indices)
+            self._line_cost = cost if self._line_cost == 0 else (self._line_cost + cost) / 2
+        self._surf.blit(self._scratch, rect, rect)
+
+    def center_on(self, pos: lw.PosType):
+        origin = lw.Pos(int(pos[0] - self._size.w / 2), int(pos[1] - self._size.h / 2))
+        offset_x, offset_y = int(origin.x - self._origin.x), int(origin.y - self._origin.y)
+        self._origin = origin
+        self._changed = True
+        if self._size.w <= abs(offset_x) or self._size.h <= abs(offset_y):
+            self._repaint(self._surf.get_rect())
+            return
+        self._surf.scroll(-offset_x, -offset_y)
+        # the strips scrolled onto, the column first and then the row without the corner it shares with it
+        column = pg.Rect(self._size.w - offset_x if 0 < offset_x else 0, 0, abs(offset_x), self._size.h)
+        row = pg.Rect(0, self._size.h - offset_y if 0 < offset_y else 0, self._size.w, abs(offset_y))
+        if column.w > 0:
+            self._repaint(column)
+            row = row.clip(pg.Rect(0 if 0 < offset_x else column.w, 0, self._size.w - column.w, self._size.h))
+        if row.w > 0 and row.h > 0:
+            self._repaint(row)
+
+    def draw_line(self, color: pg.Color, start: lw.PosType, end: lw.PosType, width: float = 1):
+        self.segments.append(start, end, width, color)
+        self._head = (end[0], end[1])
+        # floored, pygame truncates towards zero which would shift lines left or above the window by a pixel
+        pg.draw.line(self._surf, color, (math.floor(start[0]) - self._origin.x, math.floor(start[1]) - self._origin.y),
+                     (math.floor(end[0]) - self._origin.x, math.floor(end[1]) - self._origin.y), int(width))
+        self._changed = True
+        self._since_fade += 1
+        if 0 < self.fade and self.fade_every <= self._since_fade:
+            self._since_fade = 0
+            self._fade_surf.set_alpha(max(int(self.fade * 255), 1))
+            self._surf.blit(self._fade_surf, (0, 0))
+
+    def clear(self):
+        self.segments.clear()
+        self._head = None
+        self._surf.fill(self._background)
+        self._since_fade = 0
+        self._changed = True
+
+    def render(self, display: pg.Surface, pos: lw.PosType = (0, 0)) -> list[pg.Rect]:
+        # returns the display rects that changed for pg.display.update, none when nothing was drawn since
+        if self._head is not None and not self._get_inner_rect().collidepoint(self._head):
+            self.center_on(self._head)
+        if not self._changed:
+            return []
+        self._changed = False
+        return [display.blit(self._surf, pos)]
@@ -0,0 +1,109 @@
+from spiral.kernel import *
+from spiral.headless import DISPLAY_SIZE
+from spiral.parallel import worker_pool, get_worker_state
+import typing
+import json
+import os
+
+
+SWEEP_FIELDS = ("magnitude", "thickness", "angle")
+
+
+class SweepAxis(object):
+    def __init__(self, instruction: int, field: str, values: typing.Iterable[float]):
+        if field not in SWEEP_FIELDS:
+            raise SpiralError(f"Cannot sweep '{field}', only {', '.join(SWEEP_FIELDS)}")
+        self.instruction = instruction
+        self.field = field
+        self.values = tuple(float(value) for value in values)
+        if len(self.values) == 0:
+            raise SpiralError("A sweep axis needs at least one value")
+
+    def __len__(self):
+        return len(self.values)
+
+    @classmethod
+    def linspace(cls, instruction: int, field: str, start: float, stop: float, count: int):
+        return cls(instruction, field, np.linspace(start, stop, count).tolist())
+
+    def to_dict(self):
+        return {"instruction": self.instruction, "field": self.field, "values": list(self.values)}
+
+
+def get_variant(program: Program, axes: typing.Sequence[SweepAxis], index: int) -> tuple[list[float], Program]:
+    # variants count through the last axis first, like nested loops over the axes in order
+    values = [axis.values[i] for axis, i in zip(axes, np.unravel_index(index, [len(axis) for axis in axes]))]
+    instructions = [instruction.copy() for instruction in program]
+    for axis, value in zip(axes, values):
+        if not 0 <= axis.instruction < len(instructions):
+            raise SpiralError(f"The program has no instruction {axis.instruction}")
+        setattr(instructions[axis.instruction], axis.field, value)
+    return values, Program(instructions)
+
+
+def render_thumbnail(program: Program, size: lw.SizeType, steps: int = None, background: pg.Color = lw.WHITE,
+                     view: lw.SizeType = DISPLAY_SIZE) -> pg.Surface:
+    # the view main() shows, drawn straight at thumbnail scale instead of drawn full size and shrunk
+    size, view = lw.Size(size), lw.Size(view)
+    if steps is None:
+        steps = program.default_steps(view)
+    scale = min(size.w / view.w, size.h / view.h)
+    path = compute_path(program, steps, (0, 0))
+    center = np.array(tuple(size)) / 2
+    starts = (path.starts * scale + center).tolist()
+    ends = (path.ends * scale + center).tolist()
+    widths = np.where(path.thicknesses < 1, 0, np.maximum(path.thicknesses * scale, 1)).astype(np.int64).tolist()
+    surf = pg.Surface(size)
+    surf.fill(background)
+    for start, end, width, color in zip(starts, ends, widths, path.colors.tolist()):
+        pg.draw.line(surf, color, start, end, width)
+    return surf
+
+
+def _render_variant(index: int):
+    state = get_worker_state()
+    _, program = get_variant(state["program"], state["axes"], index)
+    surf = render_thumbnail(program, state["thumb_size"], state["steps"], state["background"])
+    return index, pg.image.tobytes(surf, "RGB")
+
+
+def sweep(program: Program, axes: typing.Sequence[SweepAxis], path: str, index_path: str = None,
+          thumb_size: lw.SizeType = (130, 80), columns: int = None, steps: int = None,
+          background: pg.Color = lw.WHITE, processes: int = None, chunk_size: int = 4) -> pg.Surface:
+    axes = tuple(axes)
+    if len(axes) == 0:
+        raise SpiralError("A sweep needs at least one axis")
+    count = int(np.prod([len(axis) for axis in axes]))
+    # bad axes fail here instead of inside every worker
+    get_variant(program, axes, 0)
+    thumb_size = tuple(lw.Size(thumb_size))
+    columns = columns or int(np.ceil(np.sqrt(count)))
+    rows = -(-count // columns)
+    sheet = pg.Surface((columns * thumb_size[0], rows * thumb_size[1]))
+    sheet.fill(background)
+    background = tuple(pg.Color(background))
+
+    # thumbnails are pasted as they come back, only the sheet grows with the number of variants
+    with worker_pool(processes, program=program, axes=axes, thumb_size=thumb_size, steps=steps,
+                     background=background) as pool:
+        for index, data in pool.imap_unordered(_render_variant, range(count), chunk_size):
+            sheet.blit(pg.image.frombytes(data, thumb_size, "RGB"),
+                       ((index % columns) * thumb_size[0], (index // columns) * thumb_size[1]))
+    pg.image.save(sheet, path)
+
+    if index_path is None:
+        index_path = os.path.splitext(path)[0] + ".json"
+    cells = []
+    for index in range(count):
+        values, _ = get_variant(program, axes, index)
+        cells.append({"index": index,
+                      "cell": [index % columns, index // columns],
+                      "rect": [(index % columns) * thumb_size[0], (index // columns) * thumb_size[1], *thumb_size],
+                      "values": values})
+    with open(index_path, "w") as f:
+        json.dump({"program": program.to_dict(),
+                   "axes": [axis.to_dict() for axis in axes],
+                   "thumb_size": list(thumb_size),
+                   "columns": columns,
+                   "cells": cells}, f, indent=4)
+    return sheet
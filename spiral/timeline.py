@@ -0,0 +1,135 @@
+from spiral.seek import *
+from spiral.segments import *
+from spiral.canvas import TiledCanvas
+from spiral.scheduler import WAITING
+import typing
+import time
+
+
+class Checkpoint(object):
+    def __init__(self, segment: int, state: TurtleState, tiles: dict[tuple[int, int], pg.Surface]):
+        self.segment = segment
+        self.state = state
+        self.tiles = tiles
+
+
+class Timeline(object):
+    def __init__(self, program: Program, canvas: TiledCanvas, segments: SegmentBuffer,
+                 source: typing.Iterator = None, start: lw.PosType = (0, 0), angle: float = 0.0,
+                 interval: int = 4096, max_memory: int = 256 * 1024 * 1024):
+        # source draws the next segment onto the canvas and records it in segments, once per next() call,
+        # every segment it already recorded is replayed from segments instead, when the source yields WAITING
+        # nothing was drawn and next() returns WAITING as well
+        self.program = program
+        self.canvas = canvas
+        self.segments = segments
+        self._source = source
+        self._start = lw.Pos(start)
+        self._angle = angle
+        self.interval = max(interval, 1)
+        self.max_memory = max_memory
+        self._position = 0
+        self._paused = False
+        self._checkpoints: list[Checkpoint] = []
+        self._base: typing.Optional[Checkpoint] = None
+        canvas.pop_dirty_keys()
+        self._add_checkpoint()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._position < len(self.segments):
+            start, end = self.segments.starts[self._position].tolist(), self.segments.ends[self._position].tolist()
+            draw_line(self.canvas, self.segments.colors[self._position].tolist(), start, end,
+                      int(self.segments.thicknesses[self._position]))
+        elif self._source is None:
+            raise StopIteration
+        else:
+            try:
+                if next(self._source) is WAITING:
+                    return WAITING
+            except StopIteration:
+                self._source = None
+                raise
+        self._position += 1
+        if self._position % self.interval == 0 and self._find_checkpoint(self._position).segment != self._position:
+            self._add_checkpoint()
+
+    def close(self):
+        # stops the source for good, what it recorded can still be replayed
+        if self._source is not None and hasattr(self._source, "close"):
+            self._source.close()
+        self._source = None
+
+    def get_position(self):
+        return self._position
+
+    def get_length(self):
+        # segments recorded so far, the run may still go on past them
+        return len(self.segments)
+
+    def get_state(self) -> TurtleState:
+        return seek(self.program, self._position, self._start, self._angle)
+
+    def get_checkpoints(self):
+        return tuple(checkpoint.segment for checkpoint in self._checkpoints)
+
+    def is_paused(self):
+        return self._paused
+
+    def is_finished(self):
+        return self._source is None and len(self.segments) <= self._position
+
+    def pause(self):
+        self._paused = True
+
+    def resume(self):
+        self._paused = False
+
+    def toggle_pause(self):
+        self._paused = not self._paused
+
+    def get_memory(self):
+        # checkpoints share the tiles that did not change between them, count each tile once
+        tiles = {id(tile): tile for checkpoint in self._checkpoints for tile in checkpoint.tiles.values()}
+        return sum(tile.get_width() * tile.get_height() * tile.get_bytesize() for tile in tiles.values())
+
+    def _find_checkpoint(self, segment: int) -> Checkpoint:
+        found = self._checkpoints[0]
+        for checkpoint in self._checkpoints:
+            if segment < checkpoint.segment:
+                break
+            found = checkpoint
+        return found
+
+    def _add_checkpoint(self):
+        changed = self.canvas.pop_dirty_keys()
+        checkpoint = Checkpoint(self._position, self.get_state(),
+                                self.canvas.snapshot(None if self._base is None else self._base.tiles, changed))
+        self._checkpoints.append(checkpoint)
+        self._checkpoints.sort(key=lambda item: item.segment)
+        self._base = checkpoint
+        # over budget, drop every other checkpoint and take them half as often from now on
+        while self.max_memory < self.get_memory() and 1 < len(self._checkpoints):
+            self._checkpoints = self._checkpoints[::2]
+            self.interval *= 2
+            if self._base not in self._checkpoints:
+                # the next checkpoint cannot share tiles with a dropped one, it copies all of them
+                self._base = None
+
+    def seek(self, segment: int):
+        segment = max(segment, 0)
+        checkpoint = self._find_checkpoint(segment)
+        if segment < self._position or self._position < checkpoint.segment:
+            self.canvas.restore(checkpoint.tiles)
+            self.canvas.pop_dirty_keys()
+            self._position = checkpoint.segment
+            self._base = checkpoint
+        try:
+            while self._position < segment:
+                if next(self) is WAITING:
+                    # a seek past what was computed waits for it, without holding the worker thread back
+                    time.sleep(.001)
+        except StopIteration:
+            pass
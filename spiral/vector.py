@@ -0,0 +1,127 @@
+from spiral.kernel import *
+from spiral.headless import DISPLAY_SIZE, fit_canvas
+import typing
+
+
+class SvgWriter(object):
+    def __init__(self, path: str, size: lw.SizeType, background: pg.Color = lw.WHITE, precision: int = 2,
+                 max_points: int = 4096):
+        # a drawing target like TiledCanvas that streams into an svg file instead of a raster, segments that
+        # continue each other with the same color and width are merged into one polyline, only the polyline
+        # being built is kept and it is written out every max_points points, so memory does not grow with the run
+        self.size = lw.Size(size)
+        self.precision = precision
+        self.max_points = max(max_points, 2)
+        self.segments = 0
+        self.polylines = 0
+        self._file = open(path, "w")
+        self._format = f"{{:.{precision}f}},{{:.{precision}f}}".format
+        # (color, width, last point, points) of the open polyline
+        self._open: typing.Optional[tuple[tuple, int, tuple, list[str]]] = None
+        self._open_count = 0
+        background = pg.Color(background)
+        self._file.write(f'<svg xmlns="http://www.w3.org/2000/svg" width="{self.size.w}" height="{self.size.h}" '
+                         f'viewBox="0 0 {self.size.w} {self.size.h}">\n'
+                         f'<rect width="100%" height="100%" fill="{self._get_hex(background)}"/>\n'
+                         f'<g fill="none" stroke-linejoin="round">\n')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @staticmethod
+    def _get_hex(color: typing.Sequence[int]):
+        return "#{:02x}{:02x}{:02x}".format(*color[:3])
+
+    def _flush(self):
+        if self._open is None:
+            return
+        color, width, _, points = self._open
+        self._file.write(f'<polyline stroke="{self._get_hex(color)}" stroke-width="{width}" '
+                         f'points="{" ".join(points)}"/>\n')
+        self.polylines += 1
+        self._open = None
+        self._open_count = 0
+
+    def _extend(self, color: tuple, width: int, start: tuple, start_text: str, end: tuple, texts: list[str]):
+        # texts are the formatted points after start, up to end
+        # a polyline that only got too long is continued by the next one from its last point, so no gap shows
+        if self._open is None or self._open[:3] != (color, width, start) or self.max_points <= self._open_count:
+            self._flush()
+            self._open = (color, width, start, [start_text])
+            self._open_count = 1
+        self._open[3].append(" ".join(texts))
+        self._open = (color, width, end, self._open[3])
+        self._open_count += len(texts)
+        self.segments += len(texts)
+
+    def draw_line(self, color: pg.Color, start: lw.PosType, end: lw.PosType, width: float = 1):
+        # the target protocol LineDrawer draws through, widths are truncated the way pygame draws them
+        width = int(width)
+        if width < 1:
+            self._flush()
+            return
+        start, end = (float(start[0]), float(start[1])), (float(end[0]), float(end[1]))
+        self._extend(tuple(pg.Color(color)), width, start, self._format(*start), end, [self._format(*end)])
+
+    def write_path(self, path: Path, first: int = 0, last: int = None):
+        # the same as drawing every segment of the path with draw_line, with the runs found in bulk
+        last = len(path) if last is None else last
+        if last <= first:
+            return
+        starts, ends = path.starts[first:last], path.ends[first:last]
+        widths = path.thicknesses[first:last].astype(np.int64)
+        colors = path.colors[first:last]
+        # a run breaks where the width or color changes, where a hidden line was skipped or the path jumps
+        visible = widths >= 1
+        breaks = np.ones(len(widths), dtype=bool)
+        breaks[1:] = (widths[1:] != widths[:-1]) | (colors[1:] != colors[:-1]).any(axis=1) | \
+            (starts[1:] != ends[:-1]).any(axis=1) | ~visible[:-1]
+        run_starts = np.flatnonzero(breaks & visible)
+        run_ends = np.append(np.flatnonzero(breaks)[1:], len(widths))
+        run_ends = run_ends[np.searchsorted(run_ends, run_starts, "right")]
+        if not visible[0]:
+            self._flush()
+        texts = list(map(self._format, ends[:, 0].tolist(), ends[:, 1].tolist()))
+        start_points = starts[run_starts].tolist()
+        end_points = ends[run_ends - 1].tolist()
+        run_colors = colors[run_starts].tolist()
+        run_widths = widths[run_starts].tolist()
+        for start, end, run_start, run_end, color, width in zip(start_points, end_points, run_starts.tolist(),
+                                                                run_ends.tolist(), run_colors, run_widths):
+            start = tuple(start)
+            start_text = self._format(*start)
+            for piece in range(run_start, run_end, self.max_points):
+                piece_end = min(piece + self.max_points, run_end)
+                piece_last = tuple(ends[piece_end - 1].tolist()) if piece_end < run_end else tuple(end)
+                self._extend(tuple(color), width, start, start_text, piece_last, texts[piece:piece_end])
+                start, start_text = piece_last, texts[piece_end - 1]
+        if not visible[-1]:
+            self._flush()
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._flush()
+        self._file.write("</g>\n</svg>\n")
+        self._file.close()
+
+
+def export_svg(program: Program, path: str, steps: int = None, size: lw.SizeType = None,
+               background: pg.Color = lw.WHITE, precision: int = 2, chunk: int = 65536) -> SvgWriter:
+    # the run as polylines on a canvas fitted to it or started at the center of size, computed and written a chunk
+    # at a time without a raster
+    if steps is None:
+        steps = program.default_steps(DISPLAY_SIZE)
+    if size is None:
+        size, start = fit_canvas(program, steps)
+    else:
+        size = lw.Size(size)
+        start = size / 2
+    total = steps * len(program)
+    with SvgWriter(path, size, background, precision) as writer:
+        for _, segments in iter_chunks(program, 0, total, start, chunk=chunk):
+            writer.write_path(segments)
+    return writer
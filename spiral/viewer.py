@@ -0,0 +1,140 @@
+from spiral.segments import *
+from spiral.scheduler import FrameScheduler
+import standard_lib as std
+import typing
+
+
+class Viewer(object):
+    def __init__(self, segments: SegmentBuffer, size: lw.SizeType, center: lw.PosType = (0, 0), zoom: float = 1.0,
+                 background: pg.Color = lw.WHITE, budget_ms: float = 12.0, zoom_range: tuple[float, float] = (1/64, 64)):
+        self.segments = segments
+        self._size = lw.Size(size)
+        self._center = lw.Pos(center)
+        self._zoom = zoom
+        self._zoom_range = zoom_range
+        self._background = pg.Color(background)
+        self._front = pg.Surface(self._size)
+        self._front.fill(self._background)
+        self._back = pg.Surface(self._size)
+        self._preview: typing.Optional[pg.Surface] = None
+        # (center, zoom, segment count) the front surface shows and the one the current job is drawing
+        self._front_view: typing.Optional[tuple] = None
+        self._job_view: typing.Optional[tuple] = None
+        self._job: typing.Optional[typing.Iterator] = None
+        self._job_surf: typing.Optional[pg.Surface] = None
+        self._scheduler = FrameScheduler(budget_ms)
+        self._dragging = False
+        # whether the display still shows what the last render blitted
+        self._shown = False
+
+    def get_size(self):
+        return self._size.copy()
+
+    def get_center(self):
+        return self._center.copy()
+
+    def set_center(self, center: lw.PosType):
+        self._center = lw.Pos(center)
+
+    def get_zoom(self):
+        return self._zoom
+
+    def set_zoom(self, zoom: float):
+        self._zoom = min(max(zoom, self._zoom_range[0]), self._zoom_range[1])
+
+    def invalidate(self):
+        self._shown = False
+
+    def get_stats(self):
+        return self._scheduler.get_stats()
+
+    def to_screen(self, pos: lw.PosType) -> lw.Pos:
+        return (lw.Pos(pos) - self._center) * self._zoom + self._size / 2
+
+    def to_world(self, pos: lw.PosType) -> lw.Pos:
+        return (lw.Pos(pos) - self._size / 2) / self._zoom + self._center
+
+    def get_viewport(self) -> pg.Rect:
+        top_left = self.to_world((0, 0))
+        return pg.Rect(int(top_left.x) - 1, int(top_left.y) - 1,
+                       int(self._size.w / self._zoom) + 3, int(self._size.h / self._zoom) + 3)
+
+    def pan(self, offset: lw.OffsetType):
+        self._center = self._center - lw.Pos(offset) / self._zoom
+
+    def zoom_at(self, factor: float, screen_pos: lw.PosType):
+        anchor = self.to_world(screen_pos)
+        self.set_zoom(self._zoom * factor)
+        self._center = anchor - (lw.Pos(screen_pos) - self._size / 2) / self._zoom
+
+    def update(self, events: list[pg.event.Event]):
+        for event in events:
+            if event.type == pg.MOUSEWHEEL:
+                self.zoom_at(1.25 ** event.y, pg.mouse.get_pos())
+            elif event.type == pg.MOUSEBUTTONDOWN and event.button == 1:
+                self._dragging = True
+            elif event.type == pg.MOUSEBUTTONUP and event.button == 1:
+                self._dragging = False
+            elif event.type == pg.MOUSEMOTION and self._dragging:
+                self.pan(event.rel)
+
+    def _rasterize(self, surf: pg.Surface, first: int, last: int):
+        indices = self.segments.query(self.get_viewport(), first, last)
+        half_size = np.array(tuple(self._size)) / 2
+        center = np.array(tuple(self._center))
+        starts = ((self.segments.starts[indices] - center) * self._zoom + half_size).tolist()
+        ends = ((self.segments.ends[indices] - center) * self._zoom + half_size).tolist()
+        thicknesses = self.segments.thicknesses[indices]
+        # keep lines LineDrawer would draw at least a pixel wide when zoomed out
+        widths = np.where(thicknesses < 1, 0, np.maximum(thicknesses * self._zoom, 1)).astype(np.int64).tolist()
+        colors = self.segments.colors[indices].tolist()
+        for start, end, width, color in zip(starts, ends, widths, colors):
+            pg.draw.line(surf, color, start, end, width)
+            yield
+
+    def _make_preview(self):
+        self._preview = pg.Surface(self._size)
+        self._preview.fill(self._background)
+        if self._front_view is None:
+            return
+        old_center, old_zoom = lw.Pos(self._front_view[0]), self._front_view[1]
+        scale = self._zoom / old_zoom
+        # the part of the last finished raster that is still on screen, stretched to where it lands now
+        top_left = (self.to_world((0, 0)) - old_center) * old_zoom + self._size / 2
+        source = pg.Rect(int(top_left.x), int(top_left.y), int(self._size.w / scale) + 1,
+                         int(self._size.h / scale) + 1).clip(self._front.get_rect())
+        if source.w <= 0 or source.h <= 0:
+            return
+        dest = self.to_screen((lw.Pos(source.topleft) - self._size / 2) / old_zoom + old_center)
+        self._preview.blit(pg.transform.scale(self._front.subsurface(source),
+                                              (max(int(source.w * scale), 1), max(int(source.h * scale), 1))), dest)
+
+    def render(self, display: pg.Surface, pos: lw.PosType = (0, 0)) -> list[pg.Rect]:
+        # returns the display rects that changed for pg.display.update, none while the view and raster stand still
+        view = (tuple(self._center), self._zoom, len(self.segments))
+        if self._job is None and view == self._front_view and self._shown:
+            return []
+        current_view = self._job_view if self._job is not None else self._front_view
+        if view != current_view:
+            if current_view is not None and current_view[:2] == view[:2] and current_view[2] <= view[2]:
+                # only new segments arrived, draw them over whatever is already there
+                surf = self._job_surf if self._job is not None else self._front
+                job = self._rasterize(surf, current_view[2], view[2])
+                self._job = job if self._job is None else std.functions.chain_iters(self._job, job)
+                self._job_surf = surf
+            else:
+                self._back.fill(self._background)
+                self._job = self._rasterize(self._back, 0, view[2])
+                self._job_surf = self._back
+                self._make_preview()
+                self._scheduler.reset()
+            self._job_view = view
+
+        if self._job is not None and self._scheduler.advance(self._job):
+            if self._job_surf is self._back:
+                self._front, self._back = self._back, self._front
+            self._front_view = self._job_view
+            self._job = self._job_surf = self._job_view = self._preview = None
+
+        self._shown = True
+        return [display.blit(self._front if self._preview is None else self._preview, pos)]
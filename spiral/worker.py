@@ -0,0 +1,99 @@
+from spiral.kernel import *
+from spiral.segments import SegmentBuffer
+from spiral.scheduler import WAITING
+import threading
+import typing
+import queue
+
+
+class SimulationWorker(object):
+    def __init__(self, program: Program, steps: int | None, start: lw.PosType = (0, 0), angle: float = 0.0,
+                 mode: int = DEGREES, batch_size: int = 4096, max_queue: int = 8):
+        # computes the run a batch of segments at a time on a thread of its own, finished batches wait in a
+        # bounded queue so the worker only gets max_queue batches ahead of whoever draws them,
+        # without steps the run never ends
+        self.program = program
+        self.steps = steps
+        self.batch_size = max(batch_size, 1)
+        self._start = lw.Pos(start)
+        self._angle = angle
+        self._mode = mode
+        self._queue: queue.Queue = queue.Queue(max_queue)
+        self._cancelled = threading.Event()
+        self._error: typing.Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.cancel()
+
+    def _put(self, item) -> bool:
+        # short waits so a cancel is noticed even while the queue stays full
+        while not self._cancelled.is_set():
+            try:
+                self._queue.put(item, timeout=.05)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _run(self):
+        try:
+            total = None if self.steps is None else self.steps * len(self.program)
+            for _, path in iter_chunks(self.program, 0, total, self._start, self._angle, self._mode,
+                                       self.batch_size):
+                if self._cancelled.is_set():
+                    return
+                if not self._put(path):
+                    return
+        except BaseException as error:
+            self._error = error
+        self._put(None)
+
+    def __iter__(self) -> typing.Iterator[Path]:
+        # the batches in order, until the run is done or the worker is cancelled, WAITING while the next one is
+        # still being computed so the thread drawing them never blocks here
+        while not self._cancelled.is_set():
+            try:
+                path = self._queue.get_nowait()
+            except queue.Empty:
+                yield WAITING
+                continue
+            if path is None:
+                break
+            yield path
+        if self._error is not None:
+            raise SpiralError(f"Simulation worker failed: {self._error!r}") from self._error
+
+    def get_queued(self):
+        return self._queue.qsize()
+
+    def is_cancelled(self):
+        return self._cancelled.is_set()
+
+    def cancel(self, timeout: float = None):
+        self._cancelled.set()
+        self._thread.join(timeout)
+
+
+def animate_worker(worker: SimulationWorker, canvas, segments: SegmentBuffer = None):
+    # draws what the worker computed one segment per next() call like animate(), closing it cancels the worker
+    try:
+        for path in worker:
+            if path is WAITING:
+                yield WAITING
+                continue
+            starts = path.starts.tolist()
+            ends = path.ends.tolist()
+            thicknesses = path.thicknesses.tolist()
+            colors = path.colors.tolist()
+            for start, end, thickness, color in zip(starts, ends, thicknesses, colors):
+                draw_line(canvas, color, start, end, int(thickness))
+                if segments is not None:
+                    segments.append(start, end, thickness, color)
+                yield
+    finally:
+        worker.cancel()
@@ -0,0 +1,25 @@
+import spiral.lib as sp
+import argparse
+
+
+def main(args: list[str] = None):
+    parser = argparse.ArgumentParser(description="Render every combination of instruction values onto a contact sheet")
+    parser.add_argument("program", help="program json file, see spiral.program.Program.save")
+    parser.add_argument("output", help="contact sheet image, the index is written next to it as .json")
+    parser.add_argument("--vary", nargs=5, action="append", required=True,
+                        metavar=("INSTRUCTION", "FIELD", "START", "STOP", "COUNT"),
+                        help=f"sweep a field ({', '.join(sp.SWEEP_FIELDS)}) of an instruction, can be repeated")
+    parser.add_argument("--index", default=None, help="index file mapping the cells to their values")
+    parser.add_argument("--thumb", type=int, nargs=2, default=(130, 80), metavar=("WIDTH", "HEIGHT"))
+    parser.add_argument("--columns", type=int, default=None)
+    parser.add_argument("--steps", type=int, default=None)
+    parser.add_argument("--processes", type=int, default=None)
+    args = parser.parse_args(args)
+    axes = [sp.SweepAxis.linspace(int(instruction), field, float(start), float(stop), int(count))
+            for instruction, field, start, stop, count in args.vary]
+    sp.sweep(sp.Program.load(args.program), axes, args.output, args.index, args.thumb, args.columns, args.steps,
+             processes=args.processes)
+
+
+if __name__ == '__main__':
+    main()
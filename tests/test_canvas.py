@@ -0,0 +1,59 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import spiral.lib as sp
+import light_widgets.lib as lw
+import pygame as pg
+import random
+
+
+def _draw_spans(size, spans):
+    surf = pg.Surface(size)
+    surf.fill(lw.BLACK)
+    thick_x, majors, lows, highs = spans
+    for major, low, high in zip(majors.tolist(), lows.tolist(), highs.tolist()):
+        rect = (low, major, high - low + 1, 1) if thick_x else (major, low, 1, high - low + 1)
+        surf.fill(lw.WHITE, rect)
+    return surf
+
+
+def _different_pixels(a: pg.Surface, b: pg.Surface):
+    return int((pg.surfarray.pixels2d(a) != pg.surfarray.pixels2d(b)).sum())
+
+
+def test_line_spans_match_pygame():
+    rng = random.Random(4)
+    for _ in range(2000):
+        size = rng.choice([(200, 150), (64, 64), (31, 97)])
+        reach = rng.choice([30, 300, 1500])
+        start = (rng.randint(-reach, reach + 200), rng.randint(-reach, reach + 200))
+        end = (rng.randint(-reach, reach + 200), rng.randint(-reach, reach + 200))
+        width = rng.choice([1, 2, 3, rng.randint(1, 12), rng.randint(1, 300)])
+        spans = sp.line_spans(start, end, width, size)
+        if spans is None:
+            continue
+        expected = pg.Surface(size)
+        expected.fill(lw.BLACK)
+        pg.draw.line(expected, lw.WHITE, start, end, width)
+        assert _different_pixels(_draw_spans(size, spans), expected) == 0, (size, start, end, width)
+
+
+def _compare(size, start, steps):
+    path = sp.compute_path(sp.PRESETS["default"](), steps, start)
+    expected = pg.Surface(size)
+    expected.fill(lw.WHITE)
+    sp.draw_path(path, expected)
+    canvas = sp.TiledCanvas(size)
+    sp.draw_path(path, canvas)
+    return _different_pixels(canvas.to_surface(), expected)
+
+
+def test_tiled_canvas_matches_surface():
+    # 800 steps already draws lines far past the scratch limit
+    size, start = sp.fit_canvas(sp.PRESETS["default"](), 800)
+    assert _compare(size, start, 800) == 0
+
+
+def test_tiled_canvas_matches_surface_past_its_edges():
+    # main() starts in the middle of a fixed canvas, the run soon draws lines that leave it
+    size = lw.Size(3000, 2000)
+    assert _compare(size, size / 2, 800) == 0
@@ -0,0 +1,41 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import spiral.lib as sp
+import light_widgets.lib as lw
+import numpy as np
+import pygame as pg
+
+
+def test_density_adds_up_line_length():
+    # a line 10 pixels long through row 1 covers each of its pixels by one pixel of length
+    canvas = sp.DensityCanvas((10, 3))
+    canvas.draw_line(lw.RED, (0, 1.5), (10, 1.5), 1)
+    density = canvas.get_density()
+    assert np.allclose(density[1], 1.0)
+    assert density[0].sum() == 0 and density[2].sum() == 0
+    canvas.draw_line(lw.BLUE, (0, 1.5), (10, 1.5), 1)
+    assert np.allclose(canvas.get_density()[1], 2.0)
+    assert canvas.segments == 2
+
+
+def test_density_averages_colors_and_skips_thin_lines():
+    canvas = sp.DensityCanvas((10, 3), lw.WHITE, batch_size=1)
+    canvas.draw_line(lw.RED, (0, 1.5), (10, 1.5), 1)
+    canvas.draw_line(lw.BLUE, (0, 1.5), (10, 1.5), 1)
+    # thinner than a pixel, pygame would not draw it
+    canvas.draw_line(lw.GREEN, (0, 1.5), (10, 1.5), .5)
+    surf = canvas.to_surface()
+    assert tuple(surf.get_at((4, 1)))[:3] == (128, 0, 128)
+    assert tuple(surf.get_at((4, 0)))[:3] == (255, 255, 255)
+    assert canvas.segments == 2
+
+
+def test_accumulate_density_matches_drawing_the_run():
+    program = sp.PRESETS["default"]()
+    drawn = sp.DensityCanvas((400, 400), batch_size=100)
+    sp.execute(program, sp.LineDrawer((200, 200), 0, lw.BLUE, drawn), 40)
+    accumulated = sp.DensityCanvas((400, 400))
+    sp.accumulate_density(program, accumulated, 0, 40 * len(program), (200, 200), chunk=64)
+    assert np.allclose(accumulated.get_density(), drawn.get_density(), rtol=1e-5, atol=1e-4)
+    assert accumulated.segments == drawn.segments
+    assert (pg.surfarray.array3d(accumulated.to_surface()) == pg.surfarray.array3d(drawn.to_surface())).all()
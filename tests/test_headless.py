@@ -0,0 +1,56 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import spiral.lib as sp
+import spiral.headless
+import light_widgets.lib as lw
+import pygame as pg
+import pytest
+
+
+@pytest.mark.parametrize("program, steps", [(sp.PRESETS["square"](), 50),
+                                            (sp.PRESETS["square"](), 400),
+                                            (sp.PRESETS["star"](), 300)])
+def test_fitted_canvas_loses_no_pixels(program, steps):
+    # the same run on a canvas twice the fitted size draws nothing outside of it and the fitted one is tight
+    size, start = sp.fit_canvas(program, steps)
+    fitted = sp.render(program, steps)
+    assert fitted.get_size() == tuple(size)
+    oversized = pg.Surface((size.w * 2, size.h * 2))
+    oversized.fill(lw.WHITE)
+    sp.draw_path(sp.compute_path(program, steps, start), oversized)
+    pixels = pg.surfarray.array2d(oversized)
+    assert (pixels[:size.w, :size.h] == pg.surfarray.array2d(fitted)).all()
+    drawn = pixels != oversized.map_rgb(lw.WHITE)
+    assert drawn.sum() == drawn[:size.w, :size.h].sum()
+    drawn = drawn[:size.w, :size.h]
+    assert drawn[0].any() and drawn[-1].any() and drawn[:, 0].any() and drawn[:, -1].any()
+
+
+def test_fitted_density_is_scaled_to_the_display():
+    # a square run about twice the display size is shrunk onto it whole instead of fitted pixel for pixel
+    program = sp.PRESETS["square"]()
+    size, _ = sp.fit_canvas(program, 5000)
+    assert size.w > sp.DISPLAY_SIZE.w
+    surf = sp.render(program, 5000, density=True)
+    assert surf.get_width() <= sp.DISPLAY_SIZE.w and surf.get_height() <= sp.DISPLAY_SIZE.h
+    drawn = pg.surfarray.array2d(surf) != surf.map_rgb(lw.WHITE)
+    # the whole run is on it, only the widths of the outermost lines are not sampled
+    columns, rows = drawn.any(axis=1).nonzero()[0], drawn.any(axis=0).nonzero()[0]
+    assert columns[-1] - columns[0] > .9 * surf.get_width() and rows[-1] - rows[0] > .9 * surf.get_height()
+
+
+def test_cache_hit_skips_the_fitting_prepass(monkeypatch):
+    program = sp.PRESETS["star"]()
+    cache = sp.ResultCache()
+    first = sp.render(program, 300, cache=cache)
+    assert cache.get_stats()["misses"] == 1
+
+    def fail(*_):
+        raise AssertionError("fitted on a cache hit")
+    monkeypatch.setattr(spiral.headless, "fit_canvas", fail)
+    second = sp.render(program, 300, cache=cache)
+    assert cache.get_stats()["hits"] == 1
+    assert (pg.surfarray.array2d(first) == pg.surfarray.array2d(second)).all()
+    # asking for a size is a different render
+    sp.render(program, 300, (200, 200), cache=cache)
+    assert cache.get_stats()["misses"] == 2
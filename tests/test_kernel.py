@@ -0,0 +1,30 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import spiral.lib as sp
+import light_widgets.lib as lw
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize("preset", ["default", "square", "star"])
+def test_kernel_matches_line_drawer(preset):
+    # the same segments animate() records through a LineDrawer, one at a time
+    program = sp.PRESETS[preset]()
+    segments = sp.SegmentBuffer()
+    line_drawer = sp.LineDrawer((300, 200), 0, lw.BLUE, sp.TiledCanvas((600, 400)), segments=segments)
+    sp.execute(program, line_drawer, 60)
+    path = sp.compute_path(program, 60, (300, 200))
+    assert len(path) == len(segments)
+    assert np.allclose(path.starts, segments.starts, rtol=0, atol=1e-9)
+    assert np.allclose(path.ends, segments.ends, rtol=0, atol=1e-9)
+    assert np.allclose(path.thicknesses, segments.thicknesses, rtol=0, atol=1e-12)
+    assert (path.colors == segments.colors).all()
+
+
+def test_chunks_continue_the_whole_path():
+    program = sp.PRESETS["default"]()
+    path = sp.compute_segments(program, 5, 1000, (20, 30))
+    chunks = list(sp.iter_chunks(program, 5, 1000, (20, 30), chunk=97))
+    assert [first for first, _ in chunks] == list(range(5, 1000, 97))
+    assert (np.concatenate([chunk.starts for _, chunk in chunks]) == path.starts).all()
+    assert (np.concatenate([chunk.ends for _, chunk in chunks]) == path.ends).all()
@@ -0,0 +1,44 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import spiral.lib as sp
+import light_widgets.lib as lw
+import pygame as pg
+import subprocess
+import sys
+
+
+def test_rasterize_parallel_matches_surface():
+    # 800 steps draws lines far past the canvas scratch limit
+    program = sp.PRESETS["default"]()
+    size, start = sp.fit_canvas(program, 800)
+    path = sp.compute_path(program, 800, start)
+    expected = pg.Surface(size)
+    expected.fill(lw.WHITE)
+    sp.draw_path(path, expected)
+    surf = sp.rasterize_parallel(path, size, processes=4)
+    assert (pg.surfarray.pixels2d(surf) != pg.surfarray.pixels2d(expected)).sum() == 0
+
+
+def test_rasterize_parallel_after_pg_init():
+    # forked workers keep SDL's SIGTERM handler, the pool must still shut down, in a child so a hang times out
+    code = "\n".join(["import spiral.lib as sp",
+                      "import pygame as pg",
+                      "pg.init()",
+                      "path = sp.compute_path(sp.PRESETS['square'](), 200, (400, 400))",
+                      "sp.rasterize_parallel(path, (800, 800), processes=2)"])
+    subprocess.run([sys.executable, "-c", code], check=True, timeout=120,
+                   cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def test_sweep_after_pg_init(tmp_path):
+    # the sweep shares the worker pool, it must shut down the same way
+    code = "\n".join(["import spiral.lib as sp",
+                      "import pygame as pg",
+                      "import sys",
+                      "pg.init()",
+                      "axis = sp.SweepAxis(0, 'angle', [88, 89, 90, 91])",
+                      "sp.sweep(sp.PRESETS['square'](), [axis], sys.argv[1], "
+                      "steps=200, processes=2)"])
+    subprocess.run([sys.executable, "-c", code, str(tmp_path / "sheet.png")], check=True, timeout=120,
+                   cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    assert (tmp_path / "sheet.json").exists()
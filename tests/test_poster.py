@@ -0,0 +1,15 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import spiral.lib as sp
+import pygame as pg
+
+
+def test_poster_matches_render(tmp_path):
+    # 800 steps draws lines far past the canvas scratch limit across several bands
+    program = sp.PRESETS["default"]()
+    path = str(tmp_path / "poster.png")
+    sp.export_poster(program, path, 800)
+    expected = sp.render(program, 800)
+    poster = pg.image.load(path)
+    assert poster.get_size() == expected.get_size()
+    assert (pg.surfarray.pixels3d(poster) != pg.surfarray.pixels3d(expected)).any(axis=2).sum() == 0
@@ -0,0 +1,23 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import spiral.lib as sp
+import spiral.export
+import record
+
+
+def test_record_fits_the_run_once(tmp_path, monkeypatch):
+    program_path, output = str(tmp_path / "program.json"), str(tmp_path / "frames.raw")
+    sp.PRESETS["star"]().save(program_path)
+    calls = []
+
+    def fit_canvas(*args):
+        calls.append(args)
+        return fit(*args)
+    fit = sp.fit_canvas
+    monkeypatch.setattr(sp, "fit_canvas", fit_canvas)
+    monkeypatch.setattr(spiral.export, "fit_canvas", fit_canvas)
+    record.main([program_path, output, "--steps", "100", "--every", "50"])
+    assert len(calls) == 1
+    size, _ = fit(sp.PRESETS["star"](), 100)
+    # 200 segments, a frame every 50
+    assert os.path.getsize(output) == 4 * size.w * size.h * 3
@@ -0,0 +1,16 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import render
+import pytest
+
+
+@pytest.mark.parametrize("args", [["out.svg", "--processes", "2"],
+                                  ["out.svg", "--band", "256"],
+                                  ["out.png", "--band", "256", "--antialias"],
+                                  ["out.png", "--band", "256", "--window", "0", "10"],
+                                  ["out.png", "--density", "--antialias"],
+                                  ["out.png", "--antialias", "--processes", "2"]])
+def test_render_rejects_options_it_would_ignore(args):
+    # refused before the program file is read, so it does not have to exist
+    with pytest.raises(SystemExit):
+        render.main(["missing.json", *args])
@@ -0,0 +1,27 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import spiral.lib as sp
+import light_widgets.lib as lw
+import math
+import pytest
+
+
+@pytest.mark.parametrize("turn", [90, 144, .1, 1e-5, 1e-7, -1e-5, 359.99999, 359.9999999])
+def test_seek_matches_the_kernel(turn):
+    # 200k cycles of one instruction, the kernel adds the angles up in degrees and loses precision there once they
+    # grow large, so turns close to a full one are checked against the kernel running the same turn less a full one
+    steps = 200000
+    state = sp.seek(sp.Program([sp.Instruction(.01, .001, turn, lw.BLUE)]), steps)
+    kernel_turn = turn - 360 if 180 < turn else turn
+    path = sp.compute_segments(sp.Program([sp.Instruction(.01, .001, kernel_turn, lw.BLUE)]), 0, steps)
+    assert math.dist(tuple(state.position), path.ends[-1].tolist()) < 1e-3
+    assert state.magnitude == pytest.approx(path.get_state(steps).magnitude)
+    assert state.thickness == pytest.approx(path.get_state(steps).thickness)
+
+
+@pytest.mark.parametrize("segment", [0, 5, 12000, 12007])
+def test_seek_matches_the_kernel_mid_cycle(segment):
+    program = sp.PRESETS["default"]()
+    state = sp.seek(program, segment, (40, -3), 30)
+    path = sp.compute_segments(program, 0, segment + 1, (40, -3), 30)
+    assert math.dist(tuple(state.position), path.starts[-1].tolist()) < 1e-6
@@ -0,0 +1,48 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import spiral.lib as sp
+import light_widgets.lib as lw
+import pygame as pg
+
+
+def _make_timeline(steps: int, interval: int):
+    program = sp.PRESETS["default"]()
+    canvas = sp.TiledCanvas((800, 800), 128)
+    segments = sp.SegmentBuffer()
+    line_drawer = sp.LineDrawer((400, 400), 0, lw.BLUE, canvas, segments=segments)
+    return sp.Timeline(program, canvas, segments, sp.animate(program, line_drawer, steps), (400, 400),
+                       interval=interval)
+
+
+def _pixels(canvas: sp.TiledCanvas):
+    surf = pg.Surface(canvas.get_size())
+    canvas.render(surf)
+    return pg.surfarray.array2d(surf)
+
+
+def test_seek_back_restores_the_canvas():
+    # 100 steps of 12 segments with a checkpoint every 64, seeking lands between checkpoints
+    timeline = _make_timeline(100, 64)
+    timeline.seek(700)
+    at_700 = _pixels(timeline.canvas)
+    timeline.seek(1200)
+    assert 1 < len(timeline.get_checkpoints())
+    end = _pixels(timeline.canvas)
+    timeline.seek(700)
+    assert timeline.get_position() == 700
+    assert (_pixels(timeline.canvas) == at_700).all()
+    state = timeline.get_state()
+    assert state.segment == 700
+    assert tuple(state.position) == tuple(sp.seek(timeline.program, 700, (400, 400)).position)
+    # forward again replays the recorded segments onto the restored tiles
+    timeline.seek(1200)
+    assert (_pixels(timeline.canvas) == end).all()
+
+
+def test_seek_matches_a_fresh_run():
+    timeline = _make_timeline(100, 64)
+    timeline.seek(1200)
+    timeline.seek(333)
+    fresh = _make_timeline(100, 64)
+    fresh.seek(333)
+    assert (_pixels(timeline.canvas) == _pixels(fresh.canvas)).all()
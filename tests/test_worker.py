@@ -0,0 +1,38 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import spiral.lib as sp
+import numpy as np
+import time
+
+
+def test_worker_never_blocks_the_drawing_thread():
+    # WAITING comes back at once while a batch is still being computed, and the batches still arrive whole
+    program = sp.PRESETS["default"]()
+    segments = sp.SegmentBuffer()
+    canvas = sp.DensityCanvas((600, 600))
+    coroutine = sp.animate_worker(sp.SimulationWorker(program, 200, (300, 300), batch_size=256), canvas, segments)
+    while True:
+        start = time.perf_counter()
+        try:
+            item = next(coroutine)
+        except StopIteration:
+            break
+        if item is sp.WAITING:
+            assert time.perf_counter() - start < .05
+            time.sleep(.001)
+    path = sp.compute_path(program, 200, (300, 300))
+    assert len(segments) == len(path)
+    assert np.array_equal(segments.ends, path.ends)
+
+
+def test_scheduler_ends_the_frame_on_waiting():
+    def coroutine():
+        yield
+        yield sp.WAITING
+        yield
+    scheduler = sp.FrameScheduler(budget_ms=1000, min_segments=5)
+    frames = coroutine()
+    assert not scheduler.advance(frames)
+    assert scheduler.last_segments == 1
+    assert scheduler.advance(frames)
+    assert scheduler.last_segments == 1